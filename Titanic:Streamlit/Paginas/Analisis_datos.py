@@ -1,12 +1,109 @@
+from dataclasses import dataclass
+
 from utils.configuracion import COLORS
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 import pandas as pd
-import numpy as np
-from utils.data_loader import load_data 
+from utils.aggregates import rates, totals
+from utils.cache import cached_result
+from utils.instrumentation import dataframe, plotly_chart
+from utils.profile import build_profile, dataset_profile
+
+
+# === CÁLCULO (sin Streamlit) ===
+
+@dataclass(frozen=True)
+class AnalysisData:
+    rows: int
+    columns: int
+    duplicates: int
+    total_passengers: int
+    survivors: int
+    survival_rate: float
+    numeric_columns: int
+    categorical_columns: int
+    summary_table: pd.DataFrame
+    class_counts: pd.Series
+    class_table: pd.DataFrame
+    sex_counts: pd.Series
+    embark_counts: pd.Series
+    title_counts: pd.Series
+    column_profile: pd.DataFrame
+
+
+def compute_data_analysis(df, cube, profile=None):
+    # profile: perfil del dataset ya calculado (utils/profile.py); si no se pasa, se calcula aquí
+    profile = profile or build_profile(df)
+    total_passengers, survivors, survival_rate = totals(cube)
+    numeric_columns = len(profile.dtype_groups['numeric'])
+    categorical_columns = len(profile.dtype_groups['categorical'])
+
+    summary_table = pd.DataFrame({
+        'Característica': ['Total de Pasajeros', 'Supervivientes', 'Tasa de Supervivencia', 'Variables Numéricas', 'Variables Categóricas'],
+        'Valor': [
+            f"{total_passengers:,}",
+            f"{survivors:,}",
+            f"{(survival_rate*100):.1f}%",
+            f"{numeric_columns}",
+            f"{categorical_columns}"
+        ]
+    })
+
+    class_counts = rates(cube, 'Pclass')['n']
+    class_table = pd.DataFrame({
+        'Clase': ['Primera', 'Segunda', 'Tercera'],
+        'Cantidad': [class_counts[1], class_counts[2], class_counts[3]],
+        'Porcentaje': [
+            f"{class_counts[1]/total_passengers*100:.1f}%",
+            f"{class_counts[2]/total_passengers*100:.1f}%",
+            f"{class_counts[3]/total_passengers*100:.1f}%"
+        ]
+    })
+
+    # Perfil por columna: nulos, valores distintos y rango de las numéricas
+    column_profile = pd.DataFrame({
+        'Nulos': profile.nulls,
+        'Valores distintos': profile.cardinality,
+    }).join(profile.numeric_summary.rename(columns={'min': 'Mínimo', 'max': 'Máximo', 'mean': 'Media'}))
+
+    return AnalysisData(
+        rows=profile.rows,
+        columns=profile.columns,
+        duplicates=profile.duplicates,
+        total_passengers=total_passengers,
+        survivors=survivors,
+        survival_rate=survival_rate,
+        numeric_columns=numeric_columns,
+        categorical_columns=categorical_columns,
+        summary_table=summary_table,
+        class_counts=class_counts,
+        class_table=class_table,
+        sex_counts=rates(cube, 'Sex')['n'].sort_values(ascending=False),
+        embark_counts=rates(cube, 'Embarked')['n'].sort_values(ascending=False),
+        title_counts=rates(cube, 'TITLE')['n'].sort_values(ascending=False),
+        column_profile=column_profile,
+    )
+
+
+def figure_builders(data):
+    builders = {
+        'clase': lambda: build_class_figure(data.class_counts),
+        'sexo': lambda: build_sex_figure(data.sex_counts),
+        'puerto': lambda: build_embark_figure(data.embark_counts),
+    }
+    if not data.title_counts.empty:
+        # Sin títulos (dataset sin nombres) no hay figura
+        builders['titulo'] = lambda: build_title_figure(data.title_counts)
+    return builders
+
+
+# === RENDER ===
+
+@st.fragment
+def render_data_analysis_page(df, cube):
+    profile = dataset_profile(df, cube)
+    data = cached_result(cube, 'analisis', lambda: compute_data_analysis(df, cube, profile))
+    figures = figure_builders(data)
 
-def render_data_analysis_page(df):
     st.title("🔍 Análisis Exploratorio de Datos")
     
     st.markdown("""
@@ -24,11 +121,11 @@ def render_data_analysis_page(df):
 
     col1, col2, col3 = st.columns([1,1,1])
     with col1:
-        st.metric("Filas", f"{df.shape[0]:,}")
+        st.metric("Filas", f"{data.rows:,}")
     with col2:
-        st.metric("Columnas", f"{df.shape[1]:,}")
+        st.metric("Columnas", f"{data.columns:,}")
     with col3:
-        st.metric("Duplicados", f"{df.duplicated().sum():,}")
+        st.metric("Duplicados", f"{data.duplicates:,}")
 
     st.markdown("""----""")
 
@@ -46,17 +143,10 @@ def render_data_analysis_page(df):
 
     with col2:
         st.markdown("### 📋 Resumen de Datos")
-        info_data = {
-            'Característica': ['Total de Pasajeros', 'Supervivientes', 'Tasa de Supervivencia', 'Variables Numéricas', 'Variables Categóricas'],
-            'Valor': [
-                f"{len(df):,}",
-                f"{df['Survived'].sum():,}",
-                f"{(df['Survived'].mean()*100):.1f}%",
-                f"{df.select_dtypes(include=[np.number]).shape[1]}",
-                f"{df.select_dtypes(include=['object']).shape[1]}"
-            ]
-        }
-        st.dataframe(pd.DataFrame(info_data), hide_index=True, use_container_width=True)
+        dataframe('analisis/resumen', data.summary_table, hide_index=True, use_container_width=True)
+
+    with st.expander("Ver perfil de columnas", expanded=False):
+        dataframe('analisis/perfil', data.column_profile.round(2), use_container_width=True)
 
     st.markdown("""----""")
 
@@ -72,34 +162,11 @@ def render_data_analysis_page(df):
 
     with col1:
         # Gráfico de barras por clase
-        class_counts = df['Pclass'].value_counts().sort_index()
-        fig_class = px.bar(
-            x=class_counts.index,
-            y=class_counts.values,
-            labels={'x': 'Clase', 'y': 'Número de Pasajeros'},
-            title='Distribución de Pasajeros por Clase',
-            color=class_counts.values,
-            color_continuous_scale='Blues'
-        )
-        fig_class.update_layout(showlegend=False, height=400)
-        st.plotly_chart(fig_class, use_container_width=True)
+        plotly_chart(cube, 'analisis/clase', figures['clase'], use_container_width=True)
     
     with col2:
         # Tabla de distribución
-        class_df = pd.DataFrame({
-            'Clase': ['Primera', 'Segunda', 'Tercera'],
-            'Cantidad': [
-                len(df[df['Pclass'] == 1]),
-                len(df[df['Pclass'] == 2]),
-                len(df[df['Pclass'] == 3])
-            ],
-            'Porcentaje': [
-                f"{len(df[df['Pclass'] == 1])/len(df)*100:.1f}%",
-                f"{len(df[df['Pclass'] == 2])/len(df)*100:.1f}%",
-                f"{len(df[df['Pclass'] == 3])/len(df)*100:.1f}%"
-            ]
-        })
-        st.dataframe(class_df, hide_index=True, use_container_width=True)
+        dataframe('analisis/clases', data.class_table, hide_index=True, use_container_width=True)
         
         st.info("💡 La mayoría de pasajeros viajaban en tercera clase, seguido por primera y segunda clase.")
     
@@ -110,29 +177,11 @@ def render_data_analysis_page(df):
     
     with col1:
         # Gráfico de pie por sexo
-        sex_counts = df['Sex'].value_counts()
-        fig_sex = px.pie(
-            values=sex_counts.values,
-            names=sex_counts.index,
-            title='Distribución por Sexo',
-            color_discrete_map={'male': COLORS['primary'], 'female': COLORS['success']}
-        )
-        fig_sex.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_sex, use_container_width=True)
+        plotly_chart(cube, 'analisis/sexo', figures['sexo'], use_container_width=True)
     
     with col2:
         # Distribución por puerto de embarque
-        embark_counts = df['Embarked'].value_counts()
-        fig_embark = px.bar(
-            x=embark_counts.index,
-            y=embark_counts.values,
-            labels={'x': 'Puerto de Embarque', 'y': 'Número de Pasajeros'},
-            title='Distribución por Puerto de Embarque',
-            color=embark_counts.values,
-            color_continuous_scale='Greens'
-        )
-        fig_embark.update_layout(showlegend=False, height=400)
-        st.plotly_chart(fig_embark, use_container_width=True)
+        plotly_chart(cube, 'analisis/puerto', figures['puerto'], use_container_width=True)
         st.markdown("La mayoría de pasajeros embarcó en **Southampton**, seguido por **Cherbourg** y **Queenstown**.")
 
 
@@ -141,7 +190,62 @@ def render_data_analysis_page(df):
 
 
     st.markdown("### Distribución por Título")
-    title_counts = df['TITLE'].value_counts()
+    if 'titulo' not in figures:
+        # Fuentes sin la columna Name (p. ej. titanic.csv de seaborn)
+        st.info("Este dataset no incluye los nombres de los pasajeros, así que no hay títulos que mostrar.")
+    else:
+        plotly_chart(cube, 'analisis/titulo', figures['titulo'], use_container_width=True)
+        st.markdown("Los títulos más comunes son **Mr.**, **Miss.**, y **Mrs.**, reflejando las convenciones sociales de la época.")
+
+
+# === CONSTRUCCIÓN DE FIGURAS (ver utils/figures.py) ===
+
+def build_class_figure(class_counts):
+    import plotly.express as px
+
+    fig_class = px.bar(
+        x=class_counts.index,
+        y=class_counts.values,
+        labels={'x': 'Clase', 'y': 'Número de Pasajeros'},
+        title='Distribución de Pasajeros por Clase',
+        color=class_counts.values,
+        color_continuous_scale='Blues'
+    )
+    fig_class.update_layout(showlegend=False, height=400)
+    return fig_class
+
+
+def build_sex_figure(sex_counts):
+    import plotly.express as px
+
+    fig_sex = px.pie(
+        values=sex_counts.values,
+        names=sex_counts.index,
+        title='Distribución por Sexo',
+        color_discrete_map={'male': COLORS['primary'], 'female': COLORS['success']}
+    )
+    fig_sex.update_traces(textposition='inside', textinfo='percent+label')
+    return fig_sex
+
+
+def build_embark_figure(embark_counts):
+    import plotly.express as px
+
+    fig_embark = px.bar(
+        x=embark_counts.index,
+        y=embark_counts.values,
+        labels={'x': 'Puerto de Embarque', 'y': 'Número de Pasajeros'},
+        title='Distribución por Puerto de Embarque',
+        color=embark_counts.values,
+        color_continuous_scale='Greens'
+    )
+    fig_embark.update_layout(showlegend=False, height=400)
+    return fig_embark
+
+
+def build_title_figure(title_counts):
+    import plotly.express as px
+
     fig_title = px.bar(
         x=title_counts.index,
         y=title_counts.values,
@@ -151,6 +255,4 @@ def render_data_analysis_page(df):
         color_continuous_scale='Blues'
     )
     fig_title.update_layout(showlegend=False, height=400)
-    st.plotly_chart(fig_title, use_container_width=True)
-    st.markdown("Los títulos más comunes son **Mr.**, **Miss.**, y **Mrs.**, reflejando las convenciones sociales de la época.") 
-    
\ No newline at end of file
+    return fig_title
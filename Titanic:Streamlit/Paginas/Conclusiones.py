@@ -1,13 +1,113 @@
+import io
+from dataclasses import dataclass
 
 from utils.configuracion import COLORS
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from utils.data_loader import load_data
+import pandas as pd
+from utils.aggregates import rates, totals
+from utils.stats import bootstrap_intervals, format_interval, format_rate, rate_ratio
+from utils.cache import cached_result, count_call, count_miss
+from utils.instrumentation import SectionTimer, dataframe, plotly_chart
+from utils.model import load_survival_model, score, write_scores
+
+
+# === CÁLCULO (sin Streamlit) ===
+
+@dataclass(frozen=True)
+class ConclusionsData:
+    # Tasas en proporción (0-1)
+    female_survival: float
+    male_survival: float
+    first_class_survival: float
+    third_class_survival: float
+    gender_data: pd.DataFrame
+    class_survival: pd.Series
+    class_counts: pd.Series
+    # Intervalos de confianza bootstrap (texto) por sexo y por clase
+    sex_intervals: pd.Series
+    class_intervals: pd.Series
+    interaction_df: pd.DataFrame
+    # Combinaciones de clase y sexo con la tasa más alta y la más baja (filas de interaction_df)
+    highest_group: pd.Series
+    lowest_group: pd.Series
+    total_passengers: int
+
+
+def compute_conclusions(df, cube):
+    # Calcular métricas clave (desde el cubo de agregados)
+    sex_rates = bootstrap_intervals(rates(cube, 'Sex'))
+    class_rates = bootstrap_intervals(rates(cube, 'Pclass'))
+    female_survival = sex_rates.loc['female', 'rate']
+    male_survival = sex_rates.loc['male', 'rate']
+    
+    # Datos del gráfico comparativo de género (sin los sexos que los filtros dejan vacíos)
+    gender_data = pd.DataFrame({
+        'Género': ['Mujeres', 'Hombres'],
+        'Supervivencia': [female_survival * 100, male_survival * 100],
+        'Total': [sex_rates.loc['female', 'n'], sex_rates.loc['male', 'n']]
+    })
+    gender_data = gender_data[gender_data['Total'] > 0]
+    
+    # Crear matriz de supervivencia detallada
+    interaction_data = []
+    for (pclass, sex), row in bootstrap_intervals(rates(cube, ['Pclass', 'Sex'])).iterrows():
+        interaction_data.append({
+            'Clase': f"{['Primera', 'Segunda', 'Tercera'][pclass-1]}",
+            'Sexo': 'Mujer' if sex == 'female' else 'Hombre',
+            'Tasa_Supervivencia': row['rate'] * 100,
+            'IC_95': format_interval(row['low'], row['high']),
+            'Total': int(row['n']),
+            'Supervivientes': int(row['survivors'])
+        })
+    
+    interaction_df = pd.DataFrame(interaction_data)
+    
+    return ConclusionsData(
+        female_survival=female_survival,
+        male_survival=male_survival,
+        first_class_survival=class_rates.loc[1, 'rate'],
+        third_class_survival=class_rates.loc[3, 'rate'],
+        gender_data=gender_data,
+        class_survival=class_rates['rate'],
+        class_counts=class_rates['n'],
+        sex_intervals=_intervals(sex_rates),
+        class_intervals=_intervals(class_rates),
+        interaction_df=interaction_df,
+        highest_group=interaction_df.loc[interaction_df['Tasa_Supervivencia'].idxmax()],
+        lowest_group=interaction_df.loc[interaction_df['Tasa_Supervivencia'].idxmin()],
+        total_passengers=totals(cube)[0],
+    )
+
+
+def _intervals(table):
+    return pd.Series(
+        [format_interval(low, high) for low, high in zip(table['low'], table['high'])],
+        index=table.index
+    )
+
+
+def figure_builders(data):
+    return {
+        'genero': lambda: build_gender_figure(data.gender_data),
+        'clase': lambda: build_class_figure(data.class_survival),
+    }
+
+
+# === RENDER ===
+
+@st.fragment
+def render_conclusions_page(df, cube):
+    # Tiempo de cada sección para la vista de desarrollo (?dev=1)
+    timer = SectionTimer('conclusiones')
+    data = cached_result(cube, 'conclusiones', lambda: compute_conclusions(df, cube))
+    timer.lap('calculo')
+    figures = figure_builders(data)
+    female_survival = data.female_survival
+    male_survival = data.male_survival
+    class_survival = data.class_survival
+    class_counts = data.class_counts
 
-def render_conclusions_page(df):
     st.title("🎯 Conclusiones del Análisis del Titanic")
     
     st.markdown("""
@@ -31,35 +131,35 @@ def render_conclusions_page(df):
     # Métricas de impacto visual
     col1, col2, col3 = st.columns(3)
     
-    # Calcular métricas clave
-    female_survival = df[df['Sex'] == 'female']['Survived'].mean()
-    male_survival = df[df['Sex'] == 'male']['Survived'].mean()
-    first_class_survival = df[df['Pclass'] == 1]['Survived'].mean()
-    third_class_survival = df[df['Pclass'] == 3]['Survived'].mean()
-    
+    # Con filtros, un sexo o una clase pueden quedar sin pasajeros (o sin supervivientes):
+    # el cociente no existe y se muestra "—"
+    gender_ratio = rate_ratio(female_survival, male_survival)
     with col1:
         st.metric(
             label="🚺 Ventaja de Género",
-            value=f"{female_survival/male_survival:.1f}x",
-            delta="Las mujeres tuvieron 3.9x más probabilidades",
+            value=format_rate(gender_ratio, '.1f', 'x'),
+            delta=None if np.isnan(gender_ratio) else f"Las mujeres tuvieron {gender_ratio:.1f}x más probabilidades",
             help="Ratio de supervivencia femenina vs masculina"
         )
     
     with col2:
         st.metric(
             label="💎 Ventaja de Clase",
-            value=f"{first_class_survival/third_class_survival:.1f}x",
+            value=format_rate(rate_ratio(data.first_class_survival, data.third_class_survival), '.1f', 'x'),
             delta="Primera clase vs Tercera clase",
             help="Ratio de supervivencia entre primera y tercera clase"
         )
     
     with col3:
+        model = load_survival_model()
         st.metric(
             label="🎯 Precisión del Modelo Social",
-            value="96.8%",
-            delta="Mujeres de primera clase",
-            help="La combinación más favorable de factores"
+            value=f"{model['accuracy']:.1%}",
+            delta="Regresión logística (clase, sexo, edad, tarifa, título, familia, puerto)",
+            delta_color="off",
+            help="Aciertos del modelo de supervivencia sobre un 20% de pasajeros no usados para entrenarlo"
         )
+    timer.lap('metricas')
     
     # === CONCLUSIONES POR FACTOR ===
     st.markdown("---")
@@ -73,9 +173,9 @@ def render_conclusions_page(df):
     with col1:
         st.markdown(f"""
         **📊 Datos:**
-        - Mujeres: **{female_survival:.1%}** supervivencia
-        - Hombres: **{male_survival:.1%}** supervivencia
-        - Diferencia: **{female_survival - male_survival:.1%}**
+        - Mujeres: **{format_rate(female_survival)}** supervivencia (IC 95%: {data.sex_intervals['female']})
+        - Hombres: **{format_rate(male_survival)}** supervivencia (IC 95%: {data.sex_intervals['male']})
+        - Diferencia: **{format_rate(female_survival - male_survival)}**
         
         **🎯 Conclusión:**
         El protocolo marítimo **"mujeres y niños primero"** 
@@ -84,24 +184,8 @@ def render_conclusions_page(df):
     
     with col2:
         # Gráfico comparativo de género
-        gender_data = pd.DataFrame({
-            'Género': ['Mujeres', 'Hombres'],
-            'Supervivencia': [female_survival * 100, male_survival * 100],
-            'Total': [len(df[df['Sex'] == 'female']), len(df[df['Sex'] == 'male'])]
-        })
-        
-        fig_gender = px.bar(
-            gender_data, 
-            x='Género', 
-            y='Supervivencia',
-            title='Tasa de Supervivencia por Género',
-            color='Supervivencia',
-            color_continuous_scale='RdYlGn',
-            text='Supervivencia'
-        )
-        fig_gender.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-        fig_gender.update_layout(height=350, showlegend=False)
-        st.plotly_chart(fig_gender, use_container_width=True)
+        plotly_chart(cube, 'conclusiones/genero', figures['genero'], use_container_width=True)
+    timer.lap('genero')
     
     # Factor 2: Clase Social
     st.markdown("### 🎫 Factor Clase Social")
@@ -110,34 +194,14 @@ def render_conclusions_page(df):
     
     with col1:
         # Gráfico de supervivencia por clase
-        class_survival = df.groupby('Pclass')['Survived'].mean()
-        class_counts = df.groupby('Pclass').size()
-        
-        fig_class = go.Figure()
-        
-        fig_class.add_trace(go.Bar(
-            name='Tasa de Supervivencia',
-            x=['Primera Clase', 'Segunda Clase', 'Tercera Clase'],
-            y=[class_survival[1] * 100, class_survival[2] * 100, class_survival[3] * 100],
-            marker_color=[COLORS['success'], COLORS['warning'], COLORS['danger']],
-            text=[f"{class_survival[1]:.1%}", f"{class_survival[2]:.1%}", f"{class_survival[3]:.1%}"],
-            textposition='outside'
-        ))
-        
-        fig_class.update_layout(
-            title='Supervivencia por Clase Social',
-            yaxis_title='Tasa de Supervivencia (%)',
-            height=350,
-            showlegend=False
-        )
-        st.plotly_chart(fig_class, use_container_width=True)
+        plotly_chart(cube, 'conclusiones/clase', figures['clase'], use_container_width=True)
     
     with col2:
         st.markdown(f"""
         **📊 Datos:**
-        - 1ª Clase: **{class_survival[1]:.1%}** ({class_counts[1]} pasajeros)
-        - 2ª Clase: **{class_survival[2]:.1%}** ({class_counts[2]} pasajeros)
-        - 3ª Clase: **{class_survival[3]:.1%}** ({class_counts[3]} pasajeros)
+        - 1ª Clase: **{format_rate(class_survival[1])}** ({class_counts[1]} pasajeros, IC 95%: {data.class_intervals[1]})
+        - 2ª Clase: **{format_rate(class_survival[2])}** ({class_counts[2]} pasajeros, IC 95%: {data.class_intervals[2]})
+        - 3ª Clase: **{format_rate(class_survival[3])}** ({class_counts[3]} pasajeros, IC 95%: {data.class_intervals[3]})
         
         **🎯 Conclusión:**
         La **posición socioeconómica** determinó 
@@ -145,49 +209,37 @@ def render_conclusions_page(df):
         **recursos de evacuación** (botes salvavidas, 
         ubicación de camarotes, información).
         """)
+    timer.lap('clase')
     
     # Factor 3: Interacción de Factores
     st.markdown("### 🔄 Interacción de Factores")
     
-    # Crear matriz de supervivencia detallada
-    interaction_data = []
-    for pclass in [1, 2, 3]:
-        for sex in ['female', 'male']:
-            subset = df[(df['Pclass'] == pclass) & (df['Sex'] == sex)]
-            if len(subset) > 0:
-                interaction_data.append({
-                    'Clase': f"{['Primera', 'Segunda', 'Tercera'][pclass-1]}",
-                    'Sexo': 'Mujer' if sex == 'female' else 'Hombre',
-                    'Tasa_Supervivencia': subset['Survived'].mean() * 100,
-                    'Total': len(subset),
-                    'Supervivientes': subset['Survived'].sum()
-                })
-    
-    interaction_df = pd.DataFrame(interaction_data)
-    
     col1, col2 = st.columns(2)
     
     with col1:
-        st.dataframe(
-            interaction_df[['Clase', 'Sexo', 'Tasa_Supervivencia', 'Total']].round(1),
+        dataframe(
+            'conclusiones/interaccion',
+            data.interaction_df[['Clase', 'Sexo', 'Tasa_Supervivencia', 'IC_95', 'Total']].round(1),
             column_config={
                 'Tasa_Supervivencia': st.column_config.ProgressColumn(
                     'Tasa Supervivencia (%)',
                     min_value=0,
                     max_value=100
-                )
+                ),
+                'IC_95': 'IC 95%'
             },
             hide_index=True,
             use_container_width=True
         )
     
     with col2:
-        st.markdown("""
+        highest, lowest = data.highest_group, data.lowest_group
+        st.markdown(f"""
         **💡 Insights Clave:**
         
-        1. **Máxima supervivencia**: Mujeres de 1ª clase (96.8%)
-        2. **Mínima supervivencia**: Hombres de 3ª clase (13.5%)
-        3. **Brecha máxima**: 83.3 puntos porcentuales
+        1. **Máxima supervivencia**: {highest['Sexo']}, {highest['Clase'].lower()} clase ({highest['Tasa_Supervivencia']:.1f}%)
+        2. **Mínima supervivencia**: {lowest['Sexo']}, {lowest['Clase'].lower()} clase ({lowest['Tasa_Supervivencia']:.1f}%)
+        3. **Brecha máxima**: {highest['Tasa_Supervivencia'] - lowest['Tasa_Supervivencia']:.1f} puntos porcentuales
         4. **Efecto multiplicativo**: Los factores se potencian mutuamente
         
         **🎯 Implicación**: La **intersección** de privilegios 
@@ -195,6 +247,14 @@ def render_conclusions_page(df):
         **jerarquía de supervivencia** muy marcada.
         """)
     
+    timer.lap('interaccion')
+
+    # === MODELO: ¿HABRÍA SOBREVIVIDO? ===
+    st.markdown("---")
+    st.markdown("## 🧪 ¿Habría Sobrevivido?")
+    render_what_if(model)
+    timer.lap('modelo')
+
     # === IMPLICACIONES HISTÓRICAS ===
     st.markdown("---")
     st.markdown("## 🏛️ Implicaciones Históricas y Sociales")
@@ -265,10 +325,10 @@ def render_conclusions_page(df):
     st.markdown("## 📚 Referencias y Metodología")
     
     with st.expander("📖 Fuentes de Datos y Metodología", expanded=False):
-        st.markdown("""
+        st.markdown(f"""
         ### 📊 **Fuente de Datos:**
         - **Dataset**: Titanic - Machine Learning from Disaster (Kaggle)
-        - **Registros**: 891 pasajeros con información completa
+        - **Registros**: {data.total_passengers:,} pasajeros en la selección actual
         - **Variables**: 12 características por pasajero
         - **Período**: Naufragio del RMS Titanic (15 de abril de 1912)
         
@@ -287,5 +347,109 @@ def render_conclusions_page(df):
         - **NumPy**: Cálculos numéricos
 
 """)
-        
+    timer.lap('implicaciones')
+
+
+def render_what_if(model):
+    categories = model['categories']
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Pasajero hipotético (st.form: el modelo solo se evalúa al pulsar el botón)
+        with st.form("what_if"):
+            pclass = st.selectbox("Clase", categories['Pclass'])
+            sex = st.radio("Sexo", categories['Sex'], horizontal=True,
+                           format_func=lambda value: 'Mujer' if value == 'female' else 'Hombre')
+            age = st.slider("Edad", 0, 80, 30)
+            fare = st.number_input("Tarifa", min_value=0.0, value=15.0, step=5.0)
+            title = st.selectbox("Título", categories['TITLE'])
+            family = st.number_input("Familiares a bordo", min_value=0, max_value=10, value=0)
+            embarked = st.selectbox("Puerto de embarque", categories['Embarked'])
+            submitted = st.form_submit_button("Calcular probabilidad")
+
+        if submitted:
+            passenger = pd.DataFrame([{
+                'Pclass': pclass, 'Sex': sex, 'Age': age, 'Fare': fare,
+                'TITLE': title, 'GrupoFamiliar': family, 'Embarked': embarked,
+            }])
+            st.metric("Probabilidad de supervivencia", f"{score(model, passenger)[0]:.1%}")
 
+    with col2:
+        # Puntuación por lotes de un CSV con las columnas del modelo
+        st.markdown("#### 📂 Puntuar un archivo")
+        uploaded = st.file_uploader(
+            "CSV con Pclass, Sex, Age, Fare, TITLE, GrupoFamiliar y Embarked", type='csv'
+        )
+        if uploaded is not None:
+            try:
+                rows, mean, preview, output = scored_upload(model, uploaded)
+            except ValueError as error:
+                st.error(f"No se puede puntuar {uploaded.name}: {error}")
+                return
+            st.caption(f"{rows:,} pasajeros puntuados · supervivencia media esperada {mean:.1%}")
+            dataframe('conclusiones/puntuaciones', preview, hide_index=True, use_container_width=True)
+            st.download_button(
+                "Descargar resultados",
+                output,
+                file_name=f"puntuaciones_{uploaded.name}",
+                mime='text/csv'
+            )
+
+
+# Cada archivo subido se puntúa una sola vez (Streamlit repite el script en cada
+# interacción con el archivo ya subido): clave file_id, que es distinto en cada subida,
+# más la huella del modelo
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _scored_upload(file_id, fingerprint, _model, _uploaded):
+    count_miss('puntuaciones')
+    _uploaded.seek(0)
+    output = io.BytesIO()
+    rows, mean, preview = write_scores(_model, _uploaded, output, preview_rows=100)
+    return rows, mean, preview, output.getvalue()
+
+
+def scored_upload(model, uploaded):
+    count_call('puntuaciones')
+    return _scored_upload(uploaded.file_id, model['fingerprint'], model, uploaded)
+
+
+# === CONSTRUCCIÓN DE FIGURAS (ver utils/figures.py) ===
+
+def build_gender_figure(gender_data):
+    import plotly.express as px
+
+    fig_gender = px.bar(
+        gender_data, 
+        x='Género', 
+        y='Supervivencia',
+        title='Tasa de Supervivencia por Género',
+        color='Supervivencia',
+        color_continuous_scale='RdYlGn',
+        text='Supervivencia'
+    )
+    fig_gender.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    fig_gender.update_layout(height=350, showlegend=False)
+    return fig_gender
+
+
+def build_class_figure(class_survival):
+    import plotly.graph_objects as go
+
+    fig_class = go.Figure()
+        
+    fig_class.add_trace(go.Bar(
+        name='Tasa de Supervivencia',
+        x=['Primera Clase', 'Segunda Clase', 'Tercera Clase'],
+        y=[class_survival[1] * 100, class_survival[2] * 100, class_survival[3] * 100],
+        marker_color=[COLORS['success'], COLORS['warning'], COLORS['danger']],
+        text=[format_rate(class_survival[pclass], missing='') for pclass in [1, 2, 3]],
+        textposition='outside'
+    ))
+        
+    fig_class.update_layout(
+        title='Supervivencia por Clase Social',
+        yaxis_title='Tasa de Supervivencia (%)',
+        height=350,
+        showlegend=False
+    )
+    return fig_class
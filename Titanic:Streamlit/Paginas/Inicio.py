@@ -1,32 +1,50 @@
+from dataclasses import dataclass
+
 import streamlit as st
-import plotly.express as px
-from utils.data_loader import load_data
-from  utils.configuracion   import COLORS
+import pandas as pd
+from utils.aggregates import totals
+from utils.cache import cached_result
+from utils.features import DERIVED_COLUMNS
+from utils.instrumentation import dataframe
+from utils.profile import build_profile, dataset_profile
 
 
+# === CÁLCULO (sin Streamlit) ===
 
-def render_home_page(df):
-    st.markdown("## 👋 Bienvenido al Análisis de datos del Titanic")
-    st.markdown("""
-    Esta aplicación interactiva te permite explorar y analizar datos del Titanic.  
-    """)
+@dataclass(frozen=True)
+class HomeData:
+    rows: int
+    columns: int
+    survivors: int
+    survival_rate: float
+    preview: pd.DataFrame
 
-    st.markdown("### 📊 Información del Conjunto de Datos")
 
-    st.dataframe(df.head(), use_container_width=True)   
-    st.markdown(f"El conjunto de datos contiene **{df.shape[0]}** filas y **{df.shape[1]}** columnas.") 
+def compute_home(df, cube, profile=None):
+    profile = profile or build_profile(df)
+    _, survivors, survival_rate = totals(cube)
+    return HomeData(
+        rows=profile.rows,
+        columns=profile.columns,
+        survivors=survivors,
+        survival_rate=survival_rate,
+        # Vista previa con las columnas del dataset (sin las variables derivadas)
+        preview=df.drop(columns=DERIVED_COLUMNS, errors='ignore').head(10),
+    )
 
 
+def figure_builders(data):
+    # La página de inicio no tiene figuras
+    return {}
 
-# === CARGA DE DATOS ===
-df = load_data()
 
-# === NAVEGACIÓN ===
-st.sidebar.header("🧭 Navegación")
-page = st.sidebar.radio("Selecciona una página:", ["Inicio", "Análisis", "Resultados", "Conclusiones"])
+# === RENDER ===
+
+@st.fragment
+def render_home_page(df, cube):
+    profile = dataset_profile(df, cube)
+    data = cached_result(cube, 'inicio', lambda: compute_home(df, cube, profile))
 
-# === PÁGINA HOME ===
-if page == "Inicio":
     # Título principal con emoji
     st.title("🚢 Análisis de Supervivencia del Titanic")
     
@@ -46,38 +64,37 @@ if page == "Inicio":
     
     # Información sobre el dataset
     st.markdown("---")
-    st.markdown("## 📊 Información sobre el dataset")
+    st.markdown("## 📊 Sobre el Dataset")
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.metric(
             label="Total de Pasajeros",
-            value=f"{df.shape[0]:,}",
+            value=f"{data.rows:,}",
             help="Número total de registros en el dataset"
         )
     
     with col2:
-        supervivientes = df['Survived'].sum()
         st.metric(
             label="Supervivientes",
-            value=f"{supervivientes:,}",
-            delta=f"{(supervivientes/len(df)*100):.1f}%",
+            value=f"{data.survivors:,}",
+            delta=f"{(data.survival_rate*100):.1f}%",
             help="Número y porcentaje de supervivientes"
         )
     
     with col3:
         st.metric(
             label="Variables Analizadas",
-            value=f"{df.shape[1]}",
+            value=f"{data.columns}",
             help="Número de columnas/características en el dataset"
         )
     
     # Vista previa de los datos
     st.markdown("### 👀 Vista Previa de los Datos")
     with st.expander("Ver primeras filas del dataset", expanded=False):
-        st.dataframe(df.head(10), use_container_width=True)
-        st.caption(f"Mostrando las primeras 10 filas de {df.shape[0]} registros totales")
+        dataframe('inicio/vista_previa', data.preview, use_container_width=True)
+        st.caption(f"Mostrando las primeras 10 filas de {data.rows} registros totales")
     
     # Información adicional
     st.markdown("---")
@@ -94,12 +111,3 @@ if page == "Inicio":
     
     💡 **Navega por las diferentes secciones** usando el menú lateral para explorar el análisis completo.
     """)
-
-else:
-    # Placeholder para otras páginas
-    st.title(f"Página: {page}")
-    st.write("Esta sección está en desarrollo. Pronto tendrás acceso al contenido completo.")    
-
-
-
-
@@ -1,13 +1,230 @@
+from dataclasses import dataclass
+
 from utils.configuracion import COLORS
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import streamlit as st
-import pandas as pd
 import numpy as np
-from utils.data_loader import load_data 
+import pandas as pd
+from utils.aggregates import rates, totals
+from utils.cache import cached_result
+from utils.distributions import summarize_by_group
+from utils.stats import bootstrap_intervals, format_interval, format_rate, significance_table
+from utils.features import AGE_BIN_WIDTH
+from utils.instrumentation import SectionTimer, dataframe, plotly_chart
+
+
+# === CÁLCULO (sin Streamlit) ===
+
+@dataclass(frozen=True)
+class ResultsData:
+    total_passengers: int
+    survivors: int
+    # Tasas en porcentaje (0-100)
+    survival_rate: float
+    female_survival: float
+    male_survival: float
+    first_class_survival: float
+    third_class_survival: float
+    # Tasa en proporción (0-1)
+    male_third_class_survival: float
+    # Combinaciones de clase y sexo con la tasa más alta y la más baja (etiqueta, tasa 0-100)
+    highest_group: str
+    highest_group_survival: float
+    lowest_group: str
+    lowest_group_survival: float
+    # Datos de las figuras
+    sex_survival: pd.Series
+    class_survival: pd.Series
+    embark_survival: pd.Series
+    age_rates: pd.DataFrame
+    survival_matrix: pd.DataFrame
+    age_distributions: dict
+    family_survival: pd.DataFrame
+    group_survival: pd.DataFrame
+    # Tablas
+    detailed_table: pd.DataFrame
+    age_stats: pd.DataFrame
+    age_stats_table: pd.DataFrame
+    family_table: pd.DataFrame
+    group_table: pd.DataFrame
+    # Grupos de 2 o más pasajeros por desenlace y pasajeros sin familia declarada que
+    # viajaban en grupo
+    group_outcomes: pd.Series
+    hidden_companions: int
+    factors_summary: pd.DataFrame
+    significance_tests: pd.DataFrame
+
+
+def compute_results(df, cube):
+    # Calcular métricas principales (desde el cubo de agregados, sin recorrer las filas)
+    total_passengers, survivors, survival_rate = totals(cube)
+    
+    # Métricas por categorías principales (con intervalo de confianza bootstrap: 'low', 'high')
+    sex_rates = bootstrap_intervals(rates(cube, 'Sex'))
+    class_rates = bootstrap_intervals(rates(cube, 'Pclass'))
+    class_sex_rates = bootstrap_intervals(rates(cube, ['Pclass', 'Sex']))
+    
+    # Tabla de valores exactos por clase y sexo
+    detailed_table = []
+    for (pclass, sex), row in class_sex_rates.iterrows():
+        detailed_table.append({
+            'Grupo': f"{'Mujer' if sex == 'female' else 'Hombre'} {['1ª', '2ª', '3ª'][pclass-1]}",
+            'Tasa': format_rate(row['rate']),
+            'IC 95%': format_interval(row['low'], row['high']),
+            'N': int(row['n'])
+        })
+    
+    highest, lowest = class_sex_rates['rate'].idxmax(), class_sex_rates['rate'].idxmin()
+    labels = pd.Series([row['Grupo'] for row in detailed_table], index=class_sex_rates.index)
+    
+    # Distribución de edad por supervivencia: curva de densidad, cuartiles y momentos
+    # calculados aquí (el violín no recibe las edades de cada pasajero)
+    age_distributions = summarize_by_group(df['Age'], df['Survived'], [0, 1])
+    age_stats = pd.DataFrame(age_distributions).T[['mean', 'median', 'std']].astype(float).round(2)
+    age_stats_table = pd.DataFrame({
+        'Estadística': ['Edad Promedio', 'Edad Mediana', 'Desviación Estándar'],
+        'No Supervivientes': [f"{age_stats.loc[0, 'mean']:.1f}", 
+                             f"{age_stats.loc[0, 'median']:.1f}", 
+                             f"{age_stats.loc[0, 'std']:.1f}"],
+        'Supervivientes': [f"{age_stats.loc[1, 'mean']:.1f}", 
+                          f"{age_stats.loc[1, 'median']:.1f}", 
+                          f"{age_stats.loc[1, 'std']:.1f}"]
+    })
+    
+    # Tamaño de familia = SibSp + Parch + 1 (variable derivada calculada al cargar)
+    family_survival = bootstrap_intervals(rates(cube, 'FamilyCategory')).rename(columns={'rate': 'mean', 'n': 'count'})
+    family_table = pd.DataFrame({
+        'Tamaño Familia': family_survival.index,
+        'Tasa Supervivencia': [format_rate(rate) for rate in family_survival['mean']],
+        'IC 95%': [format_interval(low, high) for low, high in zip(family_survival['low'], family_survival['high'])],
+        'Total Pasajeros': family_survival['count']
+    })
+    
+    # Grupos de viaje (billete o apellido compartidos, utils/groups.py). El tamaño es el
+    # del grupo completo; el desenlace se cuenta con los miembros de la selección
+    group_survival = bootstrap_intervals(rates(cube, 'GroupCategory')).rename(columns={'rate': 'mean', 'n': 'count'})
+    group_counts = df.groupby('GroupCategory', observed=False)['GroupId'].nunique()
+    group_table = pd.DataFrame({
+        'Grupo de Viaje': group_survival.index,
+        'Tasa Supervivencia': [format_rate(rate) for rate in group_survival['mean']],
+        'IC 95%': [format_interval(low, high) for low, high in zip(group_survival['low'], group_survival['high'])],
+        'Total Pasajeros': group_survival['count'],
+        'Grupos': group_counts.reindex(group_survival.index).to_numpy(),
+    })
+    hidden_companions = int(((df['FamilySize'] == 1) & (df['GroupSize'] > 1)).sum())
+    
+    # Tabla resumen de todos los factores
+    factors_summary = []
+    
+    # Por sexo
+    for sex in ['female', 'male']:
+        row = sex_rates.loc[sex]
+        factors_summary.append({
+            'Factor': f"Sexo: {'Femenino' if sex == 'female' else 'Masculino'}",
+            'N': int(row['n']),
+            'Supervivientes': int(row['survivors']),
+            'Tasa': format_rate(row['rate']),
+            'IC 95%': format_interval(row['low'], row['high']),
+            'Impacto': _impact(row['rate'])
+        })
+    
+    # Por clase
+    for pclass in [1, 2, 3]:
+        row = class_rates.loc[pclass]
+        factors_summary.append({
+            'Factor': f"Clase: {['Primera', 'Segunda', 'Tercera'][pclass-1]}",
+            'N': int(row['n']),
+            'Supervivientes': int(row['survivors']),
+            'Tasa': format_rate(row['rate']),
+            'IC 95%': format_interval(row['low'], row['high']),
+            'Impacto': _impact(row['rate'])
+        })
+    
+    return ResultsData(
+        total_passengers=total_passengers,
+        survivors=survivors,
+        survival_rate=survival_rate * 100,
+        female_survival=sex_rates.loc['female', 'rate'] * 100,
+        male_survival=sex_rates.loc['male', 'rate'] * 100,
+        first_class_survival=class_rates.loc[1, 'rate'] * 100,
+        third_class_survival=class_rates.loc[3, 'rate'] * 100,
+        male_third_class_survival=class_sex_rates.loc[(3, 'male'), 'rate'],
+        highest_group=labels[highest],
+        highest_group_survival=class_sex_rates.loc[highest, 'rate'] * 100,
+        lowest_group=labels[lowest],
+        lowest_group_survival=class_sex_rates.loc[lowest, 'rate'] * 100,
+        sex_survival=sex_rates['rate'],
+        class_survival=class_rates['rate'],
+        embark_survival=rates(cube, 'Embarked')['rate'],
+        age_rates=rates(cube, 'AgeBin'),
+        survival_matrix=class_sex_rates['rate'].unstack(),
+        age_distributions=age_distributions,
+        family_survival=family_survival,
+        group_survival=group_survival,
+        detailed_table=pd.DataFrame(detailed_table),
+        age_stats=age_stats,
+        age_stats_table=age_stats_table,
+        family_table=family_table,
+        group_table=group_table,
+        group_outcomes=group_outcomes(df['GroupId'], df['Survived']),
+        hidden_companions=hidden_companions,
+        factors_summary=pd.DataFrame(factors_summary),
+        # Chi-cuadrado de independencia entre cada factor y la supervivencia
+        significance_tests=significance_table(cube, {
+            'Sex': 'Sexo',
+            'Pclass': 'Clase',
+            'Embarked': 'Puerto de embarque',
+            'FamilyCategory': 'Tamaño de familia',
+            'GroupCategory': 'Grupo de viaje',
+            'AgeBin': 'Edad (tramos de 5 años)',
+        }),
+    )
+
+
+def _impact(rate):
+    if np.isnan(rate):
+        return "—"
+    return 'Alto' if rate > 0.6 or rate < 0.3 else 'Medio'
+
+
+def group_outcomes(group_ids, survived):
+    # Grupos con 2 o más pasajeros según sobrevivan todos, algunos o ninguno (conteos por
+    # grupo con bincount sobre los códigos del grupo: sin bucles por grupo)
+    codes, _ = pd.factorize(group_ids)
+    members = np.bincount(codes)
+    survivors = np.bincount(codes, weights=survived.to_numpy(dtype='float64'))
+    shared = members > 1
+    outcome = np.select(
+        [survivors[shared] == members[shared], survivors[shared] == 0],
+        ['Sobreviven todos', 'No sobrevive nadie'], 'Sobreviven algunos',
+    )
+    return pd.Series(outcome).value_counts().reindex(
+        ['Sobreviven todos', 'Sobreviven algunos', 'No sobrevive nadie'], fill_value=0
+    )
+
+
+def figure_builders(data):
+    return {
+        'dashboard': lambda: build_dashboard_figure(
+            data.sex_survival, data.class_survival, data.embark_survival, data.age_rates
+        ),
+        'heatmap': lambda: build_heatmap_figure(data.survival_matrix),
+        'violin': lambda: build_violin_figure(data.age_distributions),
+        'family': lambda: build_family_figure(data.family_survival),
+        'groups': lambda: build_group_figure(data.family_survival, data.group_survival),
+    }
+
+
+# === RENDER ===
+
+@st.fragment
+def render_results_page(df, cube):
+    # Tiempo de cada sección para la vista de desarrollo (?dev=1)
+    timer = SectionTimer('resultados')
+    data = cached_result(cube, 'resultados', lambda: compute_results(df, cube))
+    timer.lap('calculo')
+    figures = figure_builders(data)
+    age_stats = data.age_stats
 
-def render_results_page(df):
     st.title("📈 Resultados y Hallazgos Principales")
     
     st.markdown("""
@@ -18,32 +235,22 @@ def render_results_page(df):
     # === MÉTRICAS PRINCIPALES ===
     st.markdown("## 🎯 Métricas Clave del Análisis")
     
-    # Calcular métricas principales
-    total_passengers = len(df)
-    survivors = df['Survived'].sum()
-    survival_rate = (survivors / total_passengers) * 100
-    
-    # Métricas por categorías principales
-    female_survival = df[df['Sex'] == 'female']['Survived'].mean() * 100
-    male_survival = df[df['Sex'] == 'male']['Survived'].mean() * 100
-    first_class_survival = df[df['Pclass'] == 1]['Survived'].mean() * 100
-    third_class_survival = df[df['Pclass'] == 3]['Survived'].mean() * 100
-    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric(
             label="Tasa General de Supervivencia",
-            value=f"{survival_rate:.1f}%",
-            delta=f"{survivors} de {total_passengers}",
+            value=f"{data.survival_rate:.1f}%",
+            delta=f"{data.survivors} de {data.total_passengers}",
             help="Porcentaje total de pasajeros que sobrevivieron"
         )
     
+    # Con filtros, un sexo o una clase pueden quedar sin pasajeros (tasa NaN): "—" y sin delta
     with col2:
         st.metric(
             label="Supervivencia Femenina",
-            value=f"{female_survival:.1f}%",
-            delta=f"+{female_survival - survival_rate:.1f}% vs promedio",
+            value=format_rate(data.female_survival, '.1f', '%'),
+            delta=format_rate(data.female_survival - data.survival_rate, '+.1f', '% vs promedio', missing=None),
             delta_color="normal",
             help="Tasa de supervivencia de las mujeres"
         )
@@ -51,8 +258,8 @@ def render_results_page(df):
     with col3:
         st.metric(
             label="Supervivencia Primera Clase",
-            value=f"{first_class_survival:.1f}%",
-            delta=f"+{first_class_survival - survival_rate:.1f}% vs promedio",
+            value=format_rate(data.first_class_survival, '.1f', '%'),
+            delta=format_rate(data.first_class_survival - data.survival_rate, '+.1f', '% vs promedio', missing=None),
             delta_color="normal",
             help="Tasa de supervivencia en primera clase"
         )
@@ -60,11 +267,12 @@ def render_results_page(df):
     with col4:
         st.metric(
             label="Brecha Clase Social",
-            value=f"{first_class_survival - third_class_survival:.1f}pp",
+            value=format_rate(data.first_class_survival - data.third_class_survival, '.1f', 'pp'),
             delta="Primera vs Tercera clase",
             delta_color="off",
             help="Diferencia en puntos porcentuales entre primera y tercera clase"
         )
+    timer.lap('metricas')
     
 
 
@@ -75,75 +283,8 @@ def render_results_page(df):
     # 1. Dashboard de Supervivencia por Factores Principales
     st.markdown("### 🎯 Panel de Supervivencia por Factores Críticos")
     
-    # Crear subplot con múltiples gráficos
-    fig_dashboard = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=('Supervivencia por Sexo', 'Supervivencia por Clase', 
-                       'Supervivencia por Puerto', 'Supervivencia por Edad'),
-        specs=[[{"type": "bar"}, {"type": "bar"}],
-               [{"type": "bar"}, {"type": "histogram"}]]
-    )
-    
-    # Gráfico 1: Supervivencia por Sexo
-    sex_survival = df.groupby('Sex')['Survived'].mean()
-    fig_dashboard.add_trace(
-        go.Bar(x=['Femenino', 'Masculino'], 
-               y=[sex_survival['female'], sex_survival['male']],
-               name='Por Sexo',
-               marker_color=[COLORS['success'], COLORS['primary']]),
-        row=1, col=1
-    )
-    
-    # Gráfico 2: Supervivencia por Clase
-    class_survival = df.groupby('Pclass')['Survived'].mean()
-    fig_dashboard.add_trace(
-        go.Bar(x=['Primera', 'Segunda', 'Tercera'], 
-               y=[class_survival[1], class_survival[2], class_survival[3]],
-               name='Por Clase',
-               marker_color=[COLORS['success'], COLORS['warning'], COLORS['danger']]),
-        row=1, col=2
-    )
-    
-    # Gráfico 3: Supervivencia por Puerto
-    embark_survival = df.groupby('Embarked')['Survived'].mean()
-    embark_labels = {'C': 'Cherbourg', 'Q': 'Queenstown', 'S': 'Southampton'}
-    fig_dashboard.add_trace(
-        go.Bar(x=[embark_labels.get(port, port) for port in embark_survival.index], 
-               y=embark_survival.values,
-               name='Por Puerto',
-               marker_color=[COLORS['info'], COLORS['warning'], COLORS['primary']]),
-        row=2, col=1
-    )
-    
-    # Gráfico 4: Distribución de edad de supervivientes vs no supervivientes
-    survivors_age = df[df['Survived'] == 1]['Age'].dropna()
-    non_survivors_age = df[df['Survived'] == 0]['Age'].dropna()
-    
-    fig_dashboard.add_trace(
-        go.Histogram(x=survivors_age, name='Supervivientes', 
-                    marker_color=COLORS['success'], opacity=0.7, nbinsx=20),
-        row=2, col=2
-    )
-    fig_dashboard.add_trace(
-        go.Histogram(x=non_survivors_age, name='No Supervivientes', 
-                    marker_color=COLORS['danger'], opacity=0.7, nbinsx=20),
-        row=2, col=2
-    )
-    
-    fig_dashboard.update_layout(
-        height=700,
-        showlegend=True,
-        title_text="Panel de Resultados - Factores de Supervivencia",
-        title_x=0.5
-    )
-    
-    # Actualizar ejes Y para mostrar porcentajes
-    fig_dashboard.update_yaxes(title_text="Tasa de Supervivencia", row=1, col=1)
-    fig_dashboard.update_yaxes(title_text="Tasa de Supervivencia", row=1, col=2)
-    fig_dashboard.update_yaxes(title_text="Tasa de Supervivencia", row=2, col=1)
-    fig_dashboard.update_yaxes(title_text="Número de Pasajeros", row=2, col=2)
-    
-    st.plotly_chart(fig_dashboard, use_container_width=True)
+    plotly_chart(cube, 'resultados/dashboard', figures['dashboard'], use_container_width=True)
+    timer.lap('dashboard')
     
     # === ANÁLISIS DETALLADO ===
     st.markdown("---")
@@ -155,54 +296,20 @@ def render_results_page(df):
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Crear matriz de supervivencia
-        survival_matrix = df.groupby(['Pclass', 'Sex'])['Survived'].mean().unstack()
-        
-        fig_heatmap = px.imshow(
-            survival_matrix.values,
-            x=['Femenino', 'Masculino'],
-            y=['Primera Clase', 'Segunda Clase', 'Tercera Clase'],
-            color_continuous_scale='RdYlGn',
-            aspect='auto',
-            title='Tasa de Supervivencia por Clase y Sexo'
-        )
-        
-        # Añadir texto con los valores
-        for i in range(len(survival_matrix.index)):
-            for j in range(len(survival_matrix.columns)):
-                fig_heatmap.add_annotation(
-                    x=j, y=i,
-                    text=f"{survival_matrix.iloc[i, j]:.1%}",
-                    showarrow=False,
-                    font=dict(color="white" if survival_matrix.iloc[i, j] < 0.5 else "black", size=14)
-                )
-        
-        fig_heatmap.update_layout(height=400)
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        plotly_chart(cube, 'resultados/heatmap', figures['heatmap'], use_container_width=True)
     
     with col2:
         st.markdown("#### 💡 Insights del heatmap:")
-        st.markdown("""
-        - **Mujeres de 1ª clase**: Tasa más alta (96.8%)
-        - **Hombres de 3ª clase**: Tasa más baja (13.5%)
-        - **Diferencia máxima**: 83.3 puntos porcentuales
+        st.markdown(f"""
+        - **{data.highest_group}**: Tasa más alta ({data.highest_group_survival:.1f}%)
+        - **{data.lowest_group}**: Tasa más baja ({data.lowest_group_survival:.1f}%)
+        - **Diferencia máxima**: {data.highest_group_survival - data.lowest_group_survival:.1f} puntos porcentuales
         - **Patrón claro**: Clase y sexo interactúan fuertemente
         """)
         
         # Tabla de valores exactos
-        detailed_table = []
-        for pclass in [1, 2, 3]:
-            for sex in ['female', 'male']:
-                subset = df[(df['Pclass'] == pclass) & (df['Sex'] == sex)]
-                if len(subset) > 0:
-                    rate = subset['Survived'].mean()
-                    detailed_table.append({
-                        'Grupo': f"{'Mujer' if sex == 'female' else 'Hombre'} {['1ª', '2ª', '3ª'][pclass-1]}",
-                        'Tasa': f"{rate:.1%}",
-                        'N': len(subset)
-                    })
-        
-        st.dataframe(pd.DataFrame(detailed_table), hide_index=True, use_container_width=True)
+        dataframe('resultados/detalle', data.detailed_table, hide_index=True, use_container_width=True)
+    timer.lap('heatmap')
     
     # 3. Análisis de Distribución de Edades
     st.markdown("### 👥 Análisis de Supervivencia por Edad")
@@ -211,34 +318,11 @@ def render_results_page(df):
     
     with col1:
         # Gráfico de violín por edad y supervivencia
-        fig_violin = px.violin(
-            df, 
-            x='Survived', 
-            y='Age', 
-            box=True,
-            title='Distribución de Edades por Estado de Supervivencia',
-            labels={'Survived': 'Supervivió', 'Age': 'Edad'},
-            color='Survived',
-            color_discrete_map={0: COLORS['danger'], 1: COLORS['success']}
-        )
-        fig_violin.update_layout(height=400)
-        fig_violin.update_xaxes(tickvals=[0, 1], ticktext=['No', 'Sí'])
-        st.plotly_chart(fig_violin, use_container_width=True)
+        plotly_chart(cube, 'resultados/violin', figures['violin'], use_container_width=True)
     
     with col2:
         # Estadísticas de edad por supervivencia
-        age_stats = df.groupby('Survived')['Age'].agg(['mean', 'median', 'std']).round(2)
-        age_stats_formatted = pd.DataFrame({
-            'Estadística': ['Edad Promedio', 'Edad Mediana', 'Desviación Estándar'],
-            'No Supervivientes': [f"{age_stats.loc[0, 'mean']:.1f}", 
-                                 f"{age_stats.loc[0, 'median']:.1f}", 
-                                 f"{age_stats.loc[0, 'std']:.1f}"],
-            'Supervivientes': [f"{age_stats.loc[1, 'mean']:.1f}", 
-                              f"{age_stats.loc[1, 'median']:.1f}", 
-                              f"{age_stats.loc[1, 'std']:.1f}"]
-        })
-        
-        st.dataframe(age_stats_formatted, hide_index=True, use_container_width=True)
+        dataframe('resultados/edad', data.age_stats_table, hide_index=True, use_container_width=True)
         
         st.markdown("#### 📊 Observaciones sobre Edad:")
         st.markdown(f"""
@@ -247,45 +331,49 @@ def render_results_page(df):
         - **Diferencia**: {age_stats.loc[0, 'mean'] - age_stats.loc[1, 'mean']:.1f} años
         - Los supervivientes tienden a ser ligeramente más jóvenes
         """)
+    timer.lap('violin')
     
     
     # 4. Análisis de Tamaño Familiar
-    if 'SibSp' in df.columns and 'Parch' in df.columns:
-        st.markdown("### 👨‍👩‍👧‍👦 Supervivencia por Tamaño de Familia")
-        
-        df['FamilySize'] = df['SibSp'] + df['Parch'] + 1  # +1 para incluir al pasajero
-        df['FamilyCategory'] = df['FamilySize'].apply(
-            lambda x: 'Solo' if x == 1 
-            else 'Pequeña (2-4)' if x <= 4 
-            else 'Grande (5+)'
-        )
+    st.markdown("### 👨‍👩‍👧‍👦 Supervivencia por Tamaño de Familia")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        plotly_chart(cube, 'resultados/family', figures['family'], use_container_width=True)
+    
+    with col2:
+        dataframe('resultados/familia', data.family_table, hide_index=True, use_container_width=True)
         
+        st.info("💡 **Observación**: Las familias de tamaño mediano (2-4 personas) tuvieron mejores tasas de supervivencia que los pasajeros solos o familias muy grandes.")
+    timer.lap('family')
+
+    # 5. Grupos de Viaje (billete o apellido compartidos)
+    st.markdown("### 🧳 Supervivencia por Grupo de Viaje")
+    st.markdown("""
+    Los pasajeros que comparten **billete**, o **apellido** con la misma clase, puerto y tamaño
+    de familia, forman un grupo de viaje: incluye a acompañantes que no aparecen en SibSp/Parch.
+    """)
+    
+    if data.group_outcomes.sum() == 0:
+        st.info("Este dataset no tiene billetes ni nombres (o ningún pasajero los comparte): no se detectan grupos de viaje.")
+    else:
         col1, col2 = st.columns(2)
         
         with col1:
-            family_survival = df.groupby('FamilyCategory')['Survived'].agg(['mean', 'count'])
-            
-            fig_family = px.bar(
-                x=family_survival.index,
-                y=family_survival['mean'],
-                title='Tasa de Supervivencia por Tamaño de Familia',
-                labels={'x': 'Tamaño de Familia', 'y': 'Tasa de Supervivencia'},
-                color=family_survival['mean'],
-                color_continuous_scale='RdYlGn'
-            )
-            fig_family.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig_family, use_container_width=True)
+            plotly_chart(cube, 'resultados/groups', figures['groups'], use_container_width=True)
         
         with col2:
-            family_table = pd.DataFrame({
-                'Tamaño Familia': family_survival.index,
-                'Tasa Supervivencia': [f"{rate:.1%}" for rate in family_survival['mean']],
-                'Total Pasajeros': family_survival['count']
-            })
-            st.dataframe(family_table, hide_index=True, use_container_width=True)
+            dataframe('resultados/grupos', data.group_table, hide_index=True, use_container_width=True)
+            dataframe('resultados/desenlace', data.group_outcomes.rename_axis('Desenlace del grupo').reset_index(name='Grupos'),
+                      hide_index=True, use_container_width=True)
             
-            st.info("💡 **Observación**: Las familias de tamaño mediano (2-4 personas) tuvieron mejores tasas de supervivencia que los pasajeros solos o familias muy grandes.")
-    
+            st.info(f"💡 **Observación**: {data.hidden_companions} pasajeros sin familia declarada viajaban en un "
+                    "grupo de viaje, así que no estaban realmente solos. Sin familia declarada solo el billete los "
+                    "enlaza: comparten billete con alguien del grupo, que a su vez puede estar unido a otros por "
+                    "billete o por apellido.")
+    timer.lap('grupos')
+
     # === HALLAZGOS PRINCIPALES ===
     st.markdown("---")
     st.markdown("## 🏆 Hallazgos Principales")
@@ -295,8 +383,8 @@ def render_results_page(df):
     with col1:
         st.markdown("### ✅ Factores que Aumentaron la Supervivencia:")
         st.markdown(f"""
-        1. **Ser mujer**: {female_survival:.1f}% vs {male_survival:.1f}% (hombres)
-        2. **Viajar en primera clase**: {first_class_survival:.1f}% de supervivencia
+        1. **Ser mujer**: {format_rate(data.female_survival, '.1f', '%')} vs {format_rate(data.male_survival, '.1f', '%')} (hombres)
+        2. **Viajar en primera clase**: {format_rate(data.first_class_survival, '.1f', '%')} de supervivencia
         3. **Edad joven**: Los supervivientes eran ~{age_stats.loc[0, 'mean'] - age_stats.loc[1, 'mean']:.1f} años más jóvenes
         4. **Familia mediana**: Mejor que viajar solo o en grupos grandes
         5. **Puerto Cherbourg**: Ligeramente mejor tasa de supervivencia
@@ -305,48 +393,31 @@ def render_results_page(df):
     with col2:
         st.markdown("### ❌ Factores de Riesgo:")
         st.markdown(f"""
-        1. **Ser hombre**: Solo {male_survival:.1f}% de supervivencia
-        2. **Tercera clase**: Solo {third_class_survival:.1f}% de supervivencia
+        1. **Ser hombre**: Solo {format_rate(data.male_survival, '.1f', '%')} de supervivencia
+        2. **Tercera clase**: Solo {format_rate(data.third_class_survival, '.1f', '%')} de supervivencia
         3. **Viajar solo**: Menor apoyo familiar
         4. **Familias grandes**: Dificultad para evacuar juntos
-        5. **Combinación crítica**: Hombre en 3ª clase = {df[(df['Sex'] == 'male') & (df['Pclass'] == 3)]['Survived'].mean():.1%}
+        5. **Combinación crítica**: Hombre en 3ª clase = {format_rate(data.male_third_class_survival)}
         """)
     
+    timer.lap('hallazgos')
+
     # === IMPACTO ESTADÍSTICO ===
     st.markdown("---")
     st.markdown("## 📈 Significancia Estadística")
     
-    # Crear tabla resumen de todos los factores
-    factors_summary = []
-    
-    # Por sexo
-    for sex in ['female', 'male']:
-        subset = df[df['Sex'] == sex]
-        factors_summary.append({
-            'Factor': f"Sexo: {'Femenino' if sex == 'female' else 'Masculino'}",
-            'N': len(subset),
-            'Supervivientes': subset['Survived'].sum(),
-            'Tasa': f"{subset['Survived'].mean():.1%}",
-            'Impacto': 'Alto' if subset['Survived'].mean() > 0.6 or subset['Survived'].mean() < 0.3 else 'Medio'
-        })
-    
-    # Por clase
-    for pclass in [1, 2, 3]:
-        subset = df[df['Pclass'] == pclass]
-        factors_summary.append({
-            'Factor': f"Clase: {['Primera', 'Segunda', 'Tercera'][pclass-1]}",
-            'N': len(subset),
-            'Supervivientes': subset['Survived'].sum(),
-            'Tasa': f"{subset['Survived'].mean():.1%}",
-            'Impacto': 'Alto' if subset['Survived'].mean() > 0.6 or subset['Survived'].mean() < 0.3 else 'Medio'
-        })
-    
-    summary_df = pd.DataFrame(factors_summary)
-    st.dataframe(summary_df, hide_index=True, use_container_width=True)
+    dataframe('resultados/factores', data.factors_summary, hide_index=True, use_container_width=True)
+    st.caption("IC 95%: intervalo de confianza bootstrap de la tasa de supervivencia (10.000 remuestras).")
+
+    st.markdown("### Contraste chi-cuadrado de independencia con la supervivencia")
+    dataframe('resultados/contrastes', data.significance_tests, hide_index=True, use_container_width=True)
+    st.caption("p-valor < 0.05: la supervivencia no es independiente del factor. "
+               "V de Cramér: tamaño del efecto (0 = sin relación, 1 = relación total).")
+    timer.lap('resumen')
     
     # === CONCLUSIÓN FINAL ===
     st.markdown("---")
-    st.success("""
+    st.success(f"""
     ## 🎯 **Conclusión del Análisis de Resultados**
     
     Los datos del Titanic revelan un **patrón claro y consistente**: la supervivencia no fue aleatoria, sino que estuvo 
@@ -356,6 +427,205 @@ def render_results_page(df):
     significativamente estas diferencias**, creando una jerarquía de supervivencia que reflejaba las 
     desigualdades sociales de la época.
     
-    **Resultado más impactante**: Una mujer de primera clase tenía ~97% de posibilidades de sobrevivir, 
-    mientras que un hombre de tercera clase tenía solo ~14% de posibilidades.
+    **Resultado más impactante**: el grupo {data.highest_group} tuvo un {data.highest_group_survival:.0f}% de 
+    supervivencia, mientras que el grupo {data.lowest_group} tuvo solo un {data.lowest_group_survival:.0f}%.
     """)
+    timer.lap('conclusion')
+
+
+# === CONSTRUCCIÓN DE FIGURAS (ver utils/figures.py) ===
+
+def build_dashboard_figure(sex_survival, class_survival, embark_survival, age_rates):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Crear subplot con múltiples gráficos
+    fig_dashboard = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Supervivencia por Sexo', 'Supervivencia por Clase', 
+                       'Supervivencia por Puerto', 'Supervivencia por Edad'),
+        specs=[[{"type": "bar"}, {"type": "bar"}],
+               [{"type": "bar"}, {"type": "bar"}]]
+    )
+    
+    # Gráfico 1: Supervivencia por Sexo
+    fig_dashboard.add_trace(
+        go.Bar(x=['Femenino', 'Masculino'], 
+               y=[sex_survival['female'], sex_survival['male']],
+               name='Por Sexo',
+               marker_color=[COLORS['success'], COLORS['primary']]),
+        row=1, col=1
+    )
+    
+    # Gráfico 2: Supervivencia por Clase
+    fig_dashboard.add_trace(
+        go.Bar(x=['Primera', 'Segunda', 'Tercera'], 
+               y=[class_survival[1], class_survival[2], class_survival[3]],
+               name='Por Clase',
+               marker_color=[COLORS['success'], COLORS['warning'], COLORS['danger']]),
+        row=1, col=2
+    )
+    
+    # Gráfico 3: Supervivencia por Puerto
+    embark_labels = {'C': 'Cherbourg', 'Q': 'Queenstown', 'S': 'Southampton'}
+    fig_dashboard.add_trace(
+        go.Bar(x=[embark_labels.get(port, port) for port in embark_survival.index], 
+               y=embark_survival.values,
+               name='Por Puerto',
+               marker_color=[COLORS['info'], COLORS['warning'], COLORS['primary']]),
+        row=2, col=1
+    )
+    
+    # Gráfico 4: Distribución de edad de supervivientes vs no supervivientes
+    # (histograma por tramos de edad del cubo; el centro de cada barra es el centro del tramo)
+    age_centers = age_rates.index.astype(float) + AGE_BIN_WIDTH / 2
+    
+    fig_dashboard.add_trace(
+        go.Bar(x=age_centers, y=age_rates['survivors'], width=AGE_BIN_WIDTH,
+               name='Supervivientes', marker_color=COLORS['success'], opacity=0.7),
+        row=2, col=2
+    )
+    fig_dashboard.add_trace(
+        go.Bar(x=age_centers, y=age_rates['n'] - age_rates['survivors'], width=AGE_BIN_WIDTH,
+               name='No Supervivientes', marker_color=COLORS['danger'], opacity=0.7),
+        row=2, col=2
+    )
+    
+    fig_dashboard.update_layout(
+        height=700,
+        showlegend=True,
+        title_text="Panel de Resultados - Factores de Supervivencia",
+        title_x=0.5
+    )
+    
+    # Actualizar ejes Y para mostrar porcentajes
+    fig_dashboard.update_yaxes(title_text="Tasa de Supervivencia", row=1, col=1)
+    fig_dashboard.update_yaxes(title_text="Tasa de Supervivencia", row=1, col=2)
+    fig_dashboard.update_yaxes(title_text="Tasa de Supervivencia", row=2, col=1)
+    fig_dashboard.update_yaxes(title_text="Número de Pasajeros", row=2, col=2)
+    
+    return fig_dashboard
+
+
+def build_heatmap_figure(survival_matrix):
+    import plotly.express as px
+
+    fig_heatmap = px.imshow(
+        survival_matrix.values,
+        x=['Femenino', 'Masculino'],
+        y=['Primera Clase', 'Segunda Clase', 'Tercera Clase'],
+        color_continuous_scale='RdYlGn',
+        aspect='auto',
+        title='Tasa de Supervivencia por Clase y Sexo'
+    )
+    
+    # Añadir texto con los valores (todas las anotaciones en una sola actualización del layout)
+    values = survival_matrix.values
+    fig_heatmap.update_layout(
+        annotations=[
+            dict(
+                x=j, y=i,
+                text=f"{values[i, j]:.1%}",
+                showarrow=False,
+                font=dict(color="white" if values[i, j] < 0.5 else "black", size=14)
+            )
+            for i in range(values.shape[0])
+            for j in range(values.shape[1])
+        ],
+        height=400
+    )
+    return fig_heatmap
+
+
+def build_violin_figure(age_distributions):
+    import plotly.graph_objects as go
+
+    # Violín dibujado a partir de la densidad ya calculada (utils/distributions.py):
+    # las trazas tienen el mismo tamaño con 891 pasajeros que con millones
+    colors = {0: COLORS['danger'], 1: COLORS['success']}
+    fig_violin = go.Figure()
+    for survived, summary in age_distributions.items():
+        if summary['count'] == 0:
+            continue
+        if summary['density'] is not None:
+            half_width = summary['density'] / summary['density'].max() * 0.4
+            fig_violin.add_trace(go.Scatter(
+                x=[*(survived - half_width), *(survived + half_width)[::-1]],
+                y=[*summary['grid'], *summary['grid'][::-1]],
+                fill='toself',
+                mode='lines',
+                line=dict(color=colors[survived], width=1),
+                name=str(survived),
+                legendgroup=str(survived),
+                hoverinfo='skip'
+            ))
+        fig_violin.add_trace(go.Box(
+            x=[survived],
+            q1=[summary['q1']],
+            median=[summary['median']],
+            q3=[summary['q3']],
+            lowerfence=[summary['lowerfence']],
+            upperfence=[summary['upperfence']],
+            mean=[summary['mean']],
+            width=0.1,
+            marker_color=colors[survived],
+            name=str(survived),
+            legendgroup=str(survived),
+            showlegend=summary['density'] is None
+        ))
+
+    fig_violin.update_layout(
+        title='Distribución de Edades por Estado de Supervivencia',
+        xaxis_title='Supervivió',
+        yaxis_title='Edad',
+        legend_title_text='Supervivió',
+        height=400
+    )
+    fig_violin.update_xaxes(tickvals=[0, 1], ticktext=['No', 'Sí'])
+    return fig_violin
+
+
+def build_family_figure(family_survival):
+    import plotly.express as px
+
+    fig_family = px.bar(
+        x=family_survival.index,
+        y=family_survival['mean'],
+        title='Tasa de Supervivencia por Tamaño de Familia',
+        labels={'x': 'Tamaño de Familia', 'y': 'Tasa de Supervivencia'},
+        color=family_survival['mean'],
+        color_continuous_scale='RdYlGn'
+    )
+    fig_family.update_layout(height=400, showlegend=False)
+    return fig_family
+
+
+def build_group_figure(family_survival, group_survival):
+    import plotly.graph_objects as go
+
+    # Familia declarada (SibSp + Parch) frente a grupo de viaje detectado, con IC 95%
+    sizes = ['Solo', '2-4', '5+']
+    fig_groups = go.Figure()
+    for name, survival, color in [
+        ('Familia declarada', family_survival, COLORS['warning']),
+        ('Grupo de viaje', group_survival, COLORS['primary']),
+    ]:
+        fig_groups.add_trace(go.Bar(
+            x=sizes,
+            y=survival['mean'],
+            error_y=dict(
+                type='data',
+                array=survival['high'] - survival['mean'],
+                arrayminus=survival['mean'] - survival['low'],
+            ),
+            name=name,
+            marker_color=color,
+        ))
+    fig_groups.update_layout(
+        title='Tasa de Supervivencia: Familia Declarada vs Grupo de Viaje',
+        xaxis_title='Tamaño',
+        yaxis_title='Tasa de Supervivencia',
+        barmode='group',
+        height=400
+    )
+    return fig_groups
@@ -0,0 +1,55 @@
+import argparse
+import importlib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils.aggregates import build_survival_cube  # noqa: E402
+from utils.configuracion import PAGES  # noqa: E402
+from utils.data_loader import DATA_PATH, read_combined_csv  # noqa: E402
+from utils.features import add_derived_features  # noqa: E402
+
+# Uso desde la carpeta de la app:
+#   python benchmarks/compute.py
+#   python benchmarks/compute.py --data data/titanic_synthetic.csv --repeat 3
+#
+# Mide la parte de datos de cada página (compute_* y construcción de figuras) sin
+# servidor de Streamlit ni cachés: lo que paga el primer usuario de cada estado de filtros.
+
+
+def time_call(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los cálculos de cada página sin Streamlit")
+    parser.add_argument('--data', default=DATA_PATH, type=Path, help="CSV con el esquema de titanic_combined.csv")
+    parser.add_argument('--repeat', default=5, type=int, help="Repeticiones por medición (se informa la mediana)")
+    args = parser.parse_args(argv)
+
+    load_s, df = time_call(lambda: add_derived_features(read_combined_csv(args.data)), 1)
+    cube_s, cube = time_call(lambda: build_survival_cube(df, 'benchmark'), args.repeat)
+    print(f"{len(df):,} filas | carga {load_s:.3f}s | cubo {cube_s:.3f}s ({len(cube):,} celdas)\n")
+
+    print(f"{'Página':<14}{'cálculo (s)':>13}{'figuras (s)':>13}")
+    for page, (module_name, _, compute_name) in PAGES.items():
+        module = importlib.import_module(module_name)
+        compute = getattr(module, compute_name)
+        compute_s, data = time_call(lambda: compute(df, cube), args.repeat)
+        figures_s, _ = time_call(
+            lambda: [build() for build in module.figure_builders(data).values()], args.repeat
+        )
+        print(f"{page:<14}{compute_s:>13.4f}{figures_s:>13.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+APP_DIR = Path(__file__).parent.parent
+APP_PATH = APP_DIR / 'app.py'
+
+sys.path.insert(0, str(APP_DIR))
+from utils.configuracion import PAGES  # noqa: E402
+
+# Uso desde la carpeta de la app:
+#   python benchmarks/load.py
+#   python benchmarks/load.py --sessions 48 --processes 4 --switches 20 --rows 0 100000 1000000 --json load.json
+#   python benchmarks/load.py --script Resultados Conclusiones --shuffle --compare load.json
+#
+# Simula muchas sesiones a la vez con el intérprete de pruebas de Streamlit (AppTest).
+# Cada sesión abre la app y va cambiando de página según su guion. Las sesiones se
+# reparten entre --processes procesos (como réplicas del servidor); dentro de cada
+# proceso son hilos que comparten las cachés, como en un servidor real. AppTest usa
+# estado global de Streamlit, así que en un mismo proceso las ejecuciones de app.py se
+# turnan: la latencia medida incluye la espera (la de un usuario con el servidor
+# ocupado) y el tiempo de servicio (solo la ejecución) se informa aparte.
+# Cada tamaño de dataset se mide con procesos nuevos (--rows 0 es el CSV real; el resto
+# son datos sintéticos de utils/synthetic.py, servidos con TITANIC_DATA). Se informa:
+# - Latencia de cada rerun (p50/p90/p99), en total y por página
+# - Throughput: reruns por segundo de todas las sesiones
+# - Memoria: crecimiento del RSS por sesión abierta (tras una sesión de calentamiento
+#   por proceso que deja cargados los datos)
+
+PERCENTILES = [50, 90, 99]
+
+# Nombre de la primera ejecución de app.py en cada sesión (página Inicio)
+FIRST_RUN = '(apertura)'
+
+
+# Código que se ejecuta en cada proceso hijo
+CHILD_CODE = '''
+import json, logging, resource, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, {app_dir!r})
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+
+# Una ejecución de AppTest a la vez por proceso (estado global de Streamlit)
+run_lock = threading.Lock()
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        # Sin /proc (macOS): pico de RSS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+
+def timed(name, run):
+    start = time.perf_counter()
+    with run_lock:
+        service_start = time.perf_counter()
+        run()
+        end = time.perf_counter()
+    return name, end - start, end - service_start
+
+def run_session(script, barrier=None):
+    at = AppTest.from_file({app_path!r}, default_timeout=600)
+    if barrier is not None:
+        barrier.wait()
+    timings = [timed({first_run!r}, at.run)]
+    for page in script:
+        timings.append(timed(page, at.sidebar.radio[0].set_value(page).run))
+    return at, timings, [e.message for e in at.exception]
+
+scripts = {scripts!r}
+warmup = run_session(scripts[0])
+rss_base = rss_mb()
+
+barrier = threading.Barrier(len(scripts))
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=len(scripts)) as pool:
+    sessions = list(pool.map(lambda script: run_session(script, barrier), scripts))
+wall_s = time.perf_counter() - start
+# Las sesiones siguen abiertas (sus AppTest están vivos) al medir la memoria
+rss_end = rss_mb()
+
+print(json.dumps({{
+    'timings': [timing for _, timings, _ in sessions for timing in timings],
+    'wall_s': wall_s,
+    'rss_base_mb': rss_base,
+    'rss_growth_mb': rss_end - rss_base,
+    'errors': sorted({{error for _, _, errors in sessions for error in errors}}),
+}}))
+'''
+
+
+def session_scripts(pages, sessions, switches, shuffle, seed):
+    # Un guion (lista de páginas) por sesión; con shuffle cada sesión lleva su propio orden
+    rng = np.random.default_rng(seed)
+    scripts = []
+    for _ in range(sessions):
+        order = list(rng.permutation(pages)) if shuffle else list(pages)
+        scripts.append([str(order[i % len(order)]) for i in range(switches)])
+    return scripts
+
+
+def dataset_path(rows, workdir):
+    # 0: el CSV real; el resto se genera una vez y se reutiliza entre ejecuciones
+    if rows == 0:
+        return None
+    from utils.synthetic import generate
+
+    path = workdir / f"titanic_{rows}.csv"
+    if not path.exists():
+        workdir.mkdir(parents=True, exist_ok=True)
+        generate(rows, path)
+    return path
+
+
+def run_load(path, scripts, processes):
+    # Un proceso hijo por réplica, todos a la vez; cada uno recibe su parte de las sesiones
+    env = dict(os.environ)
+    if path is not None:
+        env['TITANIC_DATA'] = str(path)
+    children = []
+    for part in range(processes):
+        code = CHILD_CODE.format(
+            app_dir=str(APP_DIR), app_path=str(APP_PATH), first_run=FIRST_RUN, scripts=scripts[part::processes]
+        )
+        children.append(subprocess.Popen(
+            [sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            cwd=APP_DIR, env=env,
+        ))
+    results = []
+    for child in children:
+        stdout, stderr = child.communicate()
+        if child.returncode != 0:
+            raise RuntimeError(f"El proceso de carga terminó con error:\n{stderr[-2000:]}")
+        # La última línea de la salida es el JSON (streamlit puede escribir avisos antes)
+        results.append(json.loads(stdout.strip().splitlines()[-1]))
+    return results
+
+
+def percentiles(values):
+    return dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+
+
+def summarize(results, sessions):
+    timings = [timing for result in results for timing in result['timings']]
+    by_page = {}
+    for page, latency, _ in timings:
+        by_page.setdefault(page, []).append(latency)
+    return {
+        'reruns': len(timings),
+        # Los procesos corren a la vez: se suman sus ritmos
+        'throughput': sum(len(result['timings']) / result['wall_s'] for result in results),
+        'latency_s': percentiles([latency for _, latency, _ in timings]),
+        'service_s': percentiles([service for _, _, service in timings]),
+        'pages': {page: percentiles(values) for page, values in by_page.items()},
+        'rss_base_mb': sum(result['rss_base_mb'] for result in results),
+        'mb_per_session': sum(result['rss_growth_mb'] for result in results) / sessions,
+        'errors': sorted({error for result in results for error in result['errors']}),
+    }
+
+
+def git_commit():
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=APP_DIR)
+    return result.stdout.strip() or None
+
+
+def print_report(size, summary):
+    label = 'CSV real' if size == 0 else f"{size:,} filas"
+    print(f"\n== {label}: {summary['reruns']} reruns, {summary['throughput']:.1f} reruns/s | "
+          f"servicio p50 {summary['service_s']['p50']:.3f}s | "
+          f"RSS base {summary['rss_base_mb']:.0f} MB, +{summary['mb_per_session']:.2f} MB por sesión")
+    header = ''.join(f"{f'p{p} (s)':>10}" for p in PERCENTILES)
+    print(f"{'Latencia':<16}{header}")
+    for page, values in [('total', summary['latency_s']), *summary['pages'].items()]:
+        print(f"{page:<16}" + ''.join(f"{value:>10.3f}" for value in values.values()))
+    for error in summary['errors']:
+        print(f"  ⚠️ {error}")
+
+
+def print_comparison(results, baseline):
+    # Cambio relativo frente a otra ejecución (p. ej. el JSON del commit anterior)
+    print(f"\nComparación con {baseline.get('commit') or 'la referencia'}:")
+    for size, summary in results.items():
+        previous = baseline['results'].get(size)
+        if previous is None:
+            continue
+        changes = [
+            f"{name} {summary['latency_s'][name] / previous['latency_s'][name] - 1:+.0%}"
+            for name in summary['latency_s']
+        ]
+        changes.append(f"throughput {summary['throughput'] / previous['throughput'] - 1:+.0%}")
+        changes.append(f"MB/sesión {summary['mb_per_session'] - previous['mb_per_session']:+.2f}")
+        print(f"  {int(size):>10,} filas: {', '.join(changes)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de app.py con sesiones simultáneas (AppTest)")
+    parser.add_argument('--sessions', default=20, type=int, help="Sesiones simultáneas")
+    parser.add_argument('--processes', default=1, type=int, help="Procesos (réplicas) entre los que repartir las sesiones")
+    parser.add_argument('--switches', default=8, type=int, help="Cambios de página por sesión")
+    parser.add_argument('--script', nargs='+', default=list(PAGES), choices=list(PAGES), help="Páginas del guion (en orden)")
+    parser.add_argument('--shuffle', action='store_true', help="Orden de páginas distinto en cada sesión")
+    parser.add_argument('--seed', default=0, type=int, help="Semilla del orden de páginas")
+    parser.add_argument('--rows', nargs='+', default=[0], type=int, help="Tamaños de dataset (0 = CSV real)")
+    parser.add_argument('--workdir', default=Path('/tmp/titanic_load'), type=Path, help="Carpeta de los CSV sintéticos")
+    parser.add_argument('--json', type=Path, help="Guarda los resultados en un archivo JSON para comparar entre commits")
+    parser.add_argument('--compare', type=Path, help="JSON de una ejecución anterior con la que comparar")
+    args = parser.parse_args(argv)
+
+    scripts = session_scripts(args.script, args.sessions, args.switches, args.shuffle, args.seed)
+    processes = min(args.processes, args.sessions)
+    results = {}
+    for size in args.rows:
+        # Claves de texto: así el JSON guardado y el recién calculado se comparan igual
+        results[str(size)] = summarize(run_load(dataset_path(size, args.workdir), scripts, processes), args.sessions)
+        print_report(size, results[str(size)])
+
+    if args.compare:
+        print_comparison(results, json.loads(args.compare.read_text()))
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'config': {
+                'sessions': args.sessions, 'processes': processes, 'switches': args.switches,
+                'script': args.script, 'shuffle': args.shuffle, 'seed': args.seed,
+            },
+            'results': results,
+        }
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
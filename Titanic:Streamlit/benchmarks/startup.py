@@ -0,0 +1,106 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent.parent
+APP_PATH = APP_DIR / 'app.py'
+
+sys.path.insert(0, str(APP_DIR))
+from utils.configuracion import PAGES  # noqa: E402
+
+# Módulos pesados cuya carga queremos vigilar en el arranque
+# (plotly.graph_objects no aparece: streamlit ya lo importa al arrancar)
+HEAVY_MODULES = ['plotly.express', 'plotly.subplots']
+
+# Uso desde la carpeta de la app:
+#   python benchmarks/startup.py
+#   python benchmarks/startup.py --repeat 10 --json startup.json
+#
+# Cada medición se hace en un intérprete nuevo (como tras reiniciar un pod):
+# - script_s: primera ejecución completa de app.py (página Inicio)
+# - page_import_s: importación del módulo de la página (Paginas/...)
+# - first_render_s: primer render de la página tras seleccionarla en el menú
+# - heavy_on_landing: módulos pesados ya cargados después de la página de inicio
+
+
+# Código que se ejecuta en cada proceso hijo
+CHILD_CODE = '''
+import importlib, json, sys, time
+sys.path.insert(0, {app_dir!r})
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file({app_path!r}, default_timeout=300)
+start = time.perf_counter()
+at.run()
+script_s = time.perf_counter() - start
+heavy_on_landing = [m for m in {heavy!r} if m in sys.modules]
+
+# Inicio ya se renderizó en la primera ejecución; su módulo ya está importado
+page_import_s = first_render_s = 0.0
+if {module!r} not in sys.modules:
+    start = time.perf_counter()
+    importlib.import_module({module!r})
+    page_import_s = time.perf_counter() - start
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value({page!r}).run()
+    first_render_s = time.perf_counter() - start
+
+print(json.dumps({{
+    'script_s': script_s,
+    'page_import_s': page_import_s,
+    'first_render_s': first_render_s,
+    'heavy_on_landing': heavy_on_landing,
+    'errors': [e.message for e in at.exception],
+}}))
+'''
+
+
+def measure_page(page, module):
+    code = CHILD_CODE.format(
+        app_dir=str(APP_DIR), app_path=str(APP_PATH), heavy=HEAVY_MODULES, module=module, page=page
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    # La última línea de la salida es el JSON (streamlit puede escribir avisos antes)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(repeat):
+    results = {}
+    for page, (module, _, _) in PAGES.items():
+        runs = [measure_page(page, module) for _ in range(repeat)]
+        errors = sorted({error for run in runs for error in run['errors']})
+        results[page] = {
+            'script_s': statistics.median(run['script_s'] for run in runs),
+            'page_import_s': statistics.median(run['page_import_s'] for run in runs),
+            'first_render_s': statistics.median(run['first_render_s'] for run in runs),
+            'heavy_on_landing': runs[-1]['heavy_on_landing'],
+            'errors': errors,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de app.py y el primer render de cada página")
+    parser.add_argument('--repeat', default=5, type=int, help="Procesos nuevos por página (se informa la mediana)")
+    parser.add_argument('--json', type=Path, help="Guarda los resultados en un archivo JSON para comparar entre commits")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.repeat)
+
+    print(f"{'Página':<14}{'script (s)':>12}{'import (s)':>12}{'1er render (s)':>16}")
+    for page, r in results.items():
+        print(f"{page:<14}{r['script_s']:>12.3f}{r['page_import_s']:>12.3f}{r['first_render_s']:>16.3f}")
+        for error in r['errors']:
+            print(f"  ⚠️ {error}")
+    heavy = results['Inicio']['heavy_on_landing']
+    print(f"\nMódulos pesados cargados en Inicio: {', '.join(heavy) if heavy else 'ninguno'}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Los módulos se importan como en la app (from utils...), desde la carpeta de la app
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils.data_loader import read_combined_csv  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def combined():
+    # titanic_combined.csv con el esquema de la app (sin variables derivadas)
+    return read_combined_csv(APP_DIR / 'data' / 'titanic_combined.csv')
@@ -0,0 +1,63 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from utils import api
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), api.ApiHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(server, path):
+    # (estado, cuerpo JSON) también para las respuestas de error
+    try:
+        with urlopen(server + path, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_aggregates(server):
+    status, body = get(server, '/aggregates?Sex=female')
+    assert status == 200
+    assert body['survival_rate'] == pytest.approx(body['survivors'] / body['total_passengers'])
+    assert {row['Sex']: row['rate'] for row in body['sex']}['male'] is None
+
+
+@pytest.mark.parametrize('path', ['/aggregates?Age=200,300', '/rates?by=Sex&Age=200,300'])
+def test_empty_selection_is_a_json_error(server, path):
+    status, body = get(server, path)
+    assert status == 422
+    assert 'ningún pasajero' in body['error']
+
+
+def test_empty_selection_version(server):
+    status, body = get(server, '/version?Age=200,300')
+    assert (status, body['rows']) == (200, 0)
+
+
+def test_bad_request(server):
+    status, body = get(server, '/rates?by=Desconocida')
+    assert status == 400
+    assert 'by' in body['error']
+
+
+def test_unexpected_error_is_a_json_500(server, monkeypatch):
+    def fail(df, cube, query):
+        raise ZeroDivisionError
+
+    monkeypatch.setitem(api.ENDPOINTS, '/aggregates', fail)
+    status, body = get(server, '/aggregates?Pclass=2')
+    assert status == 500
+    assert 'error' in body
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from utils.aggregates import CUBE_KEYS, build_survival_cube, update_survival_cube
+from utils.deltas import apply_delta
+from utils.features import add_derived_features
+from utils.groups import GROUP_COLUMNS
+from utils.profile import build_profile, update_profile
+
+
+@pytest.fixture(scope='module')
+def delta(combined):
+    # Lote con correcciones (supervivencia, edad, billete que une dos grupos), una fila
+    # sin cambios y pasajeros nuevos (uno comparte billete con un pasajero existente)
+    corrected = combined.iloc[[0, 1, 2, 3]].copy()
+    corrected.iloc[0, corrected.columns.get_loc('Survived')] = 1
+    corrected.iloc[1, corrected.columns.get_loc('Age')] = 5.0
+    corrected.iloc[2, corrected.columns.get_loc('Ticket')] = combined['Ticket'].iloc[10]
+    new_rows = combined.iloc[[20, 21, 22]].copy()
+    new_rows['PassengerId'] = [10_001, 10_002, 10_003]
+    new_rows.iloc[0, new_rows.columns.get_loc('Ticket')] = combined['Ticket'].iloc[30]
+    return pd.concat([corrected, new_rows], ignore_index=True)
+
+
+@pytest.fixture(scope='module')
+def rebuilt(combined, delta):
+    # Referencia: la tabla completa con el lote aplicado, calculada desde cero
+    raw = combined.set_index('PassengerId')
+    raw.update(delta.set_index('PassengerId'))
+    raw = pd.concat([raw, delta.set_index('PassengerId').drop(raw.index, errors='ignore')])
+    return add_derived_features(raw.reset_index().astype(combined.dtypes.to_dict()))
+
+
+@pytest.fixture(scope='module')
+def applied(combined, delta):
+    df = add_derived_features(combined)
+    new_df, removed, added = apply_delta(df, delta)
+    return df, new_df, removed, added
+
+
+def _sorted_cube(cube):
+    keys = {key: cube[key].astype(str) for key in CUBE_KEYS}
+    return cube.assign(**keys).sort_values(CUBE_KEYS).reset_index(drop=True)[[*CUBE_KEYS, 'n', 'survivors']]
+
+
+def test_apply_delta_rows_match_rebuild(applied, rebuilt):
+    _, new_df, _, _ = applied
+    assert list(new_df['PassengerId']) == list(rebuilt['PassengerId'])
+    for column in ['Survived', 'Age', 'Ticket', *GROUP_COLUMNS]:
+        pd.testing.assert_series_equal(new_df[column].astype(object), rebuilt[column].astype(object))
+
+
+def test_apply_delta_cube_matches_rebuild(applied, rebuilt):
+    df, _, removed, added = applied
+    cube = update_survival_cube(build_survival_cube(df, 'v1'), added, removed, 'v2')
+    pd.testing.assert_frame_equal(_sorted_cube(cube), _sorted_cube(build_survival_cube(rebuilt, 'v2')))
+
+
+def test_apply_delta_profile_matches_rebuild(applied, rebuilt):
+    df, _, removed, added = applied
+    profile = update_profile(build_profile(df), added, removed)
+    expected = build_profile(rebuilt)
+    assert (profile.rows, profile.columns, profile.duplicates) == (expected.rows, expected.columns, expected.duplicates)
+    assert profile.dtype_groups == expected.dtype_groups
+    pd.testing.assert_series_equal(profile.nulls, expected.nulls, check_dtype=False)
+    pd.testing.assert_series_equal(profile.cardinality, expected.cardinality, check_dtype=False)
+    pd.testing.assert_frame_equal(profile.numeric_summary, expected.numeric_summary, check_dtype=False)
+
+
+def test_apply_delta_marks_group_changes(applied):
+    # Los pasajeros existentes que cambian de grupo salen y vuelven a entrar
+    df, new_df, removed, added = applied
+    regrouped = df['GroupSize'].to_numpy() != new_df['GroupSize'].iloc[:len(df)].to_numpy()
+    assert regrouped.any()
+    assert set(df['PassengerId'][regrouped]) <= set(removed['PassengerId'])
+    assert set(new_df['PassengerId'].iloc[:len(df)][regrouped]) <= set(added['PassengerId'])
+    assert len(added) == len(removed) + 3
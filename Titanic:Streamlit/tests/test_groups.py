@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.features import add_derived_features
+from utils.groups import connected_components
+
+
+def naive_components(n, links):
+    # Referencia: unión-búsqueda clásica, un enlace cada vez; raíz = menor nodo del grupo
+    parent = list(range(n))
+
+    def find(node):
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    for left, right in links:
+        root_left, root_right = find(left), find(right)
+        parent[max(root_left, root_right)] = min(root_left, root_right)
+    return np.array([find(node) for node in range(n)])
+
+
+@pytest.mark.parametrize('n, links', [(50, 0), (200, 60), (200, 400), (1000, 900)])
+def test_connected_components_matches_naive(n, links):
+    rng = np.random.default_rng(n + links)
+    left = rng.integers(0, n, size=links)
+    right = rng.integers(0, n, size=links)
+    expected = naive_components(n, zip(left.tolist(), right.tolist()))
+    np.testing.assert_array_equal(connected_components(n, left, right), expected)
+
+
+def test_connected_components_long_chain():
+    # Cadena enlazada en orden inverso: obliga a varias pasadas
+    n = 500
+    left = np.arange(n - 1, 0, -1)
+    np.testing.assert_array_equal(connected_components(n, left, left - 1), np.zeros(n))
+
+
+def test_travel_groups_match_naive(combined):
+    df = add_derived_features(combined)
+
+    # Enlaces por billete y por familia (apellido + clase + puerto + tamaño declarado,
+    # solo si la clave no tiene más pasajeros que ese tamaño)
+    members = defaultdict(list)
+    for row, (ticket, surname, pclass, embarked, size) in enumerate(zip(
+        df['Ticket'], df['Surname'], df['Pclass'], df['Embarked'], df['FamilySize']
+    )):
+        members['ticket', ticket].append(row)
+        if not pd.isna(surname) and size > 1:
+            members['family', surname, pclass, None if pd.isna(embarked) else embarked, size].append(row)
+    links = [
+        (rows[0], other)
+        for key, rows in members.items()
+        if key[0] == 'ticket' or len(rows) <= key[-1]
+        for other in rows[1:]
+    ]
+    roots = naive_components(len(df), links)
+
+    ids = df['PassengerId'].to_numpy()
+    np.testing.assert_array_equal(df['GroupId'].to_numpy(), ids[roots])
+    np.testing.assert_array_equal(df['GroupSize'].to_numpy(), np.bincount(roots)[roots])
@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.stats import chi2_sf, format_rate, rate_ratio
+
+
+# Valores críticos de las tablas de la chi-cuadrado: (estadístico, grados de libertad, p)
+CRITICAL_VALUES = [
+    (3.841, 1, 0.05),
+    (6.635, 1, 0.01),
+    (10.828, 1, 0.001),
+    (5.991, 2, 0.05),
+    (9.210, 2, 0.01),
+    (7.815, 3, 0.05),
+    (11.070, 5, 0.05),
+    (18.307, 10, 0.05),
+    (23.209, 10, 0.01),
+    (43.773, 30, 0.05),
+    # Cola izquierda (serie de la gamma incompleta en lugar de la fracción continua)
+    (0.0039321, 1, 0.95),
+    (3.940, 10, 0.95),
+    (18.493, 30, 0.95),
+]
+
+
+@pytest.mark.parametrize('statistic, dof, p_value', CRITICAL_VALUES)
+def test_chi2_sf_critical_values(statistic, dof, p_value):
+    assert chi2_sf(statistic, dof) == pytest.approx(p_value, abs=1e-4)
+
+
+@pytest.mark.parametrize('statistic', [0.1, 1.0, 4.0, 20.0, 80.0])
+def test_chi2_sf_two_degrees_closed_form(statistic):
+    # Con 2 grados de libertad la cola es exactamente exp(-x/2)
+    assert chi2_sf(statistic, 2) == pytest.approx(math.exp(-statistic / 2), rel=1e-12)
+
+
+def test_chi2_sf_at_zero():
+    assert chi2_sf(0.0, 4) == 1.0
+
+
+def test_format_rate_empty_group():
+    assert format_rate(0.742) == "74.2%"
+    assert format_rate(np.nan) == "—"
+    assert format_rate(np.nan, '+.1f', '% vs promedio', missing=None) is None
+
+
+@pytest.mark.parametrize('numerator, denominator', [(np.nan, 0.2), (0.7, np.nan), (0.7, 0.0)])
+def test_rate_ratio_without_denominator(numerator, denominator):
+    assert np.isnan(rate_ratio(numerator, denominator))
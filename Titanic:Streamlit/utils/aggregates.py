@@ -0,0 +1,62 @@
+import pandas as pd
+
+
+# =====================================
+# CUBO DE SUPERVIVENCIA
+# =====================================
+# Conteos y supervivientes por cada combinación de las dimensiones de análisis.
+# Se calcula en una sola pasada sobre el dataset; después, cualquier tasa por
+# sexo, clase, puerto, título, familia, grupo de viaje o edad se obtiene sumando filas
+# del cubo (unos cientos de filas) en lugar de volver a filtrar la tabla completa.
+
+# FamilyCategory, GroupCategory y AgeBin son variables derivadas (utils/features.py)
+CUBE_KEYS = ['Pclass', 'Sex', 'Embarked', 'TITLE', 'FamilyCategory', 'GroupCategory', 'AgeBin']
+
+PCLASSES = [1, 2, 3]
+
+
+def build_survival_cube(df, fingerprint):
+    # dropna=False: los pasajeros con puerto o edad desconocidos también cuentan en los totales
+    cube = df.groupby(CUBE_KEYS, observed=True, dropna=False)['Survived'].agg(['size', 'sum'])
+    cube.columns = ['n', 'survivors']
+    cube = cube.reset_index()
+    # Clase como categórica: así las consultas devuelven las tres clases aunque un filtro
+    # deje alguna vacía (igual que el resto de dimensiones, que ya son categóricas)
+    cube['Pclass'] = pd.Categorical(cube['Pclass'], categories=PCLASSES)
+    # Huella de los datos (versión del dataset + filtros) de los que sale el cubo;
+    # identifica todo lo que se calcula a partir de él (figuras, tablas...)
+    cube.attrs['fingerprint'] = fingerprint
+    return cube
+
+
+def update_survival_cube(cube, added, removed, fingerprint):
+    # Cubo de (tabla - removed + added) sumando y restando los cubos de las filas que
+    # cambian; 'added' y 'removed' tienen los tipos (y categorías) de la tabla nueva
+    removed_cube = build_survival_cube(removed, fingerprint)
+    removed_cube[['n', 'survivors']] *= -1
+    dtypes = {key: added[key].dtype for key in CUBE_KEYS}
+    parts = [cube, build_survival_cube(added, fingerprint), removed_cube]
+    merged = pd.concat([part.astype(dtypes) for part in parts], ignore_index=True)
+    merged = merged.groupby(CUBE_KEYS, observed=True, dropna=False)[['n', 'survivors']].sum().reset_index()
+    merged = merged[merged['n'] > 0].reset_index(drop=True)
+    merged['Pclass'] = pd.Categorical(merged['Pclass'], categories=PCLASSES)
+    merged.attrs['fingerprint'] = fingerprint
+    return merged
+
+
+# =====================================
+# CONSULTAS SOBRE EL CUBO
+# =====================================
+
+def rates(cube, by):
+    # Total, supervivientes y tasa por las dimensiones pedidas (p. ej. 'Sex' o ['Pclass', 'Sex']).
+    # observed=False: los grupos vacíos aparecen con n=0 y tasa NaN en lugar de desaparecer
+    table = cube.groupby(by, observed=False)[['n', 'survivors']].sum()
+    table['rate'] = table['survivors'] / table['n']
+    return table
+
+
+def totals(cube):
+    n = int(cube['n'].sum())
+    survivors = int(cube['survivors'].sum())
+    return n, survivors, survivors / n
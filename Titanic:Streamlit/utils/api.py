@@ -0,0 +1,244 @@
+import argparse
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from Paginas.Resultados import compute_results
+from utils.aggregates import rates
+from utils.cache import cached_result
+from utils.datasets import DATASETS, DEFAULT_DATASET, load_dataset
+from utils.filters import CATEGORY_FILTERS, RANGE_FILTERS, apply_filters, load_filter_index
+from utils.stats import bootstrap_intervals
+from utils.warmup import start_data_watcher
+
+# Uso desde la carpeta de la app, junto a `streamlit run app.py`:
+#   python -m utils.api --port 8502
+#   curl 'http://127.0.0.1:8502/aggregates?Pclass=1,2&Sex=female'
+#   curl 'http://127.0.0.1:8502/rates?by=Pclass,Sex&dataset=kaggle&Age=0,18'
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================
+# API JSON DE AGREGADOS
+# =====================================
+# Servidor HTTP de la biblioteca estándar (un hilo por petición) que devuelve las
+# tasas de supervivencia de la página Resultados sin abrir una sesión de Streamlit.
+# Reutiliza la carga de datos, los índices de filtros, el cubo y compute_results de la
+# app, con sus cachés. Endpoints:
+# - /version: dataset, huella de datos y número de filas
+# - /aggregates: tasas por sexo, clase, puerto, clase x sexo, tramo de edad y familia
+# - /rates?by=Col1,Col2: tasas e intervalos bootstrap por las columnas del cubo pedidas
+# Parámetros comunes:
+# - dataset=combinado|kaggle|seaborn
+# - filtros de categoría (valores separados por comas): Pclass, Sex, Embarked, TITLE, alone
+# - filtros de rango (min,max): Age, Fare
+# Cada respuesta se guarda en memoria y lleva un ETag derivado de la huella de datos:
+# un cliente que repite la consulta con If-None-Match recibe un 304 sin cuerpo mientras
+# el dataset no cambie.
+# Errores en JSON ({'error': ...}): 400 si la consulta no es válida, 422 si ningún
+# pasajero cumple los filtros (salvo /version, que responde con 0 filas) y 500 si falla
+# el cálculo.
+
+DEFAULT_PORT = 8502
+
+# Número máximo de respuestas en memoria (se descartan las menos usadas)
+RESPONSE_CACHE_SIZE = 256
+
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+
+
+class BadRequest(ValueError):
+    status = HTTPStatus.BAD_REQUEST
+
+
+class EmptySelection(BadRequest):
+    # Filtros válidos que no dejan ningún pasajero: no hay tasas que calcular
+    status = HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def _to_json(value):
+    # Series y DataFrames de los resultados a estructuras JSON (NaN -> null)
+    if isinstance(value, pd.DataFrame):
+        return [
+            {**_index_fields(value.index.names, key), **{str(k): _to_json(v) for k, v in row.items()}}
+            for key, row in zip(value.index, value.to_dict('records'))
+        ]
+    if isinstance(value, pd.Series):
+        return _to_json(value.to_frame())
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if hasattr(value, 'item'):
+        return _to_json(value.item())
+    return value
+
+
+def _index_fields(names, key):
+    key = key if isinstance(key, tuple) else (key,)
+    return {name or 'index': _to_json(value) for name, value in zip(names, key)}
+
+
+def parse_filters(query, index):
+    # Mismo formato que devuelve render_filter_sidebar: {'categories': {...}, 'ranges': {...}}
+    categories = {}
+    for column in [*CATEGORY_FILTERS, 'alone']:
+        if column in query:
+            known = {str(value).lower(): value for value in index['bitmaps'][column]}
+            requested = [value.strip().lower() for value in query[column].split(',')]
+            unknown = [value for value in requested if value not in known]
+            if unknown:
+                raise BadRequest(f"valores desconocidos en {column}: {', '.join(unknown)}")
+            categories[column] = [known[value] for value in requested]
+
+    ranges = {}
+    for column in RANGE_FILTERS:
+        if column in query:
+            try:
+                low, high = (float(value) for value in query[column].split(','))
+            except ValueError:
+                raise BadRequest(f"{column} debe ser 'min,max'") from None
+            ranges[column] = (low, high)
+    return {'categories': categories, 'ranges': ranges}
+
+
+def filtered_data(query):
+    name = query.get('dataset', DEFAULT_DATASET)
+    if name not in DATASETS:
+        raise BadRequest(f"dataset desconocido: {name}")
+    df, cube = load_dataset(name)
+    index = load_filter_index(df, cube)
+    return apply_filters(df, cube, index, parse_filters(query, index))
+
+
+def version_payload(df, cube, query):
+    return {
+        'dataset': query.get('dataset', DEFAULT_DATASET),
+        'fingerprint': cube.attrs['fingerprint'],
+        'rows': len(df),
+    }
+
+
+def aggregates_payload(df, cube, query):
+    data = cached_result(cube, 'resultados', lambda: compute_results(df, cube))
+    return {
+        'total_passengers': data.total_passengers,
+        'survivors': data.survivors,
+        'survival_rate': data.survival_rate / 100,
+        'sex': _to_json(data.sex_survival),
+        'class': _to_json(data.class_survival),
+        'port': _to_json(data.embark_survival),
+        'class_sex': _to_json(data.survival_matrix.stack(future_stack=True).rename('rate')),
+        'age': _to_json(data.age_rates),
+        'family': _to_json(data.family_survival),
+    }
+
+
+def rates_payload(df, cube, query):
+    dimensions = cube.columns.drop(['n', 'survivors']).tolist()
+    by = [column for column in query.get('by', '').split(',') if column]
+    if not by or set(by) - set(dimensions):
+        raise BadRequest(f"'by' debe ser una lista de columnas del cubo: {', '.join(dimensions)}")
+    return {'by': by, 'rates': _to_json(bootstrap_intervals(rates(cube, by)))}
+
+
+ENDPOINTS = {
+    '/version': version_payload,
+    '/aggregates': aggregates_payload,
+    '/rates': rates_payload,
+}
+
+
+def respond(path, query):
+    # Devuelve (etag, cuerpo JSON); el cuerpo se calcula una vez por huella, ruta y consulta
+    df, cube = filtered_data(query)
+    if df.empty and path != '/version':
+        raise EmptySelection("ningún pasajero cumple los filtros seleccionados")
+    key = json.dumps([cube.attrs['fingerprint'], path, sorted(query.items())])
+    with _responses_lock:
+        if key in _responses:
+            _responses.move_to_end(key)
+            return _responses[key]
+
+    body = json.dumps(ENDPOINTS[path](df, cube, query), ensure_ascii=False).encode()
+    etag = f'"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+    with _responses_lock:
+        _responses[key] = (etag, body)
+        while len(_responses) > RESPONSE_CACHE_SIZE:
+            _responses.popitem(last=False)
+    return etag, body
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path not in ENDPOINTS:
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': f"ruta desconocida: {url.path}"})
+        # Un valor por parámetro (el último si se repite)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            etag, body = respond(url.path, query)
+        except BadRequest as error:
+            return self._send_json(error.status, {'error': str(error)})
+        except Exception:
+            # El hilo de la petición no debe morir sin respuesta: el cliente recibe un 500
+            logger.exception("Error al responder %s", self.path)
+            return self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "error interno del servidor"})
+
+        requested = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        if etag in requested or '*' in requested:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self._send(HTTPStatus.OK, body, etag)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode())
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            # Se puede guardar, pero hay que revalidar con el ETag en cada uso
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sirve los agregados de supervivencia como JSON")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección en la que escuchar")
+    parser.add_argument('--port', default=DEFAULT_PORT, type=int, help="Puerto")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    # Carga el dataset y lo mantiene al día (CSV nuevo o lotes de corrección) en segundo plano
+    start_data_watcher()
+    load_dataset(DEFAULT_DATASET)
+
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    print(f"API de agregados en http://{args.host}:{args.port} (Ctrl+C para parar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import threading
+
+import streamlit as st
+
+
+# =====================================
+# CACHÉ DE RESULTADOS DE PÁGINA
+# =====================================
+# Los objetos de resultado de cada página (compute_*) se calculan una sola vez por
+# huella de datos (versión del dataset + filtros) y se comparten entre sesiones.
+# Son de solo lectura: las páginas solo los dibujan.
+
+# Número máximo de resultados en memoria (se descartan los menos usados)
+RESULT_CACHE_SIZE = 64
+
+
+@st.cache_resource(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def _cached_result(fingerprint, name, _compute):
+    count_miss('resultados')
+    return _compute()
+
+
+def cached_result(cube, name, compute):
+    # compute: función sin argumentos que calcula el resultado (solo se llama si no está en caché)
+    count_call('resultados')
+    return _cached_result(cube.attrs['fingerprint'], name, compute)
+
+
+# =====================================
+# ACIERTOS Y FALLOS DE LAS CACHÉS
+# =====================================
+# Contadores por proceso (todas las sesiones) para el panel de rendimiento
+# (utils/instrumentation.py). Quien consulta una caché anota la llamada con count_call
+# y la función cacheada anota el fallo con count_miss (solo se ejecuta si el valor no
+# estaba en caché): aciertos = llamadas - fallos.
+
+_cache_stats = {}
+_cache_stats_lock = threading.Lock()
+
+
+def _count(name, field):
+    with _cache_stats_lock:
+        stats = _cache_stats.setdefault(name, {'calls': 0, 'misses': 0})
+        stats[field] += 1
+
+
+def count_call(name):
+    _count(name, 'calls')
+
+
+def count_miss(name):
+    _count(name, 'misses')
+
+
+def cache_stats():
+    with _cache_stats_lock:
+        return {name: dict(stats) for name, stats in _cache_stats.items()}
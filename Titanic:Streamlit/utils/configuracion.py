@@ -50,3 +50,28 @@ COLUMN_DISPLAY_NAMES = {
     'TITLE': 'Título'  # Título extraído del nombre (Sr., Sra., etc.)
 
 }
+
+
+# =====================================
+# REGISTRO DE PÁGINAS
+# =====================================
+# Nombre en el menú lateral -> (módulo, función de render, función de cálculo).
+# La función de cálculo no usa Streamlit: devuelve el objeto de resultado que dibuja el render.
+# Para añadir una página basta con crear su módulo en Paginas/ y registrarla aquí.
+PAGES = {
+    "Inicio": ("Paginas.Inicio", "render_home_page", "compute_home"),
+    "Análisis": ("Paginas.Analisis_datos", "render_data_analysis_page", "compute_data_analysis"),
+    "Resultados": ("Paginas.Resultados", "render_results_page", "compute_results"),
+    "Conclusiones": ("Paginas.Conclusiones", "render_conclusions_page", "compute_conclusions"),
+}
+
+
+# =====================================
+# PRESUPUESTO DE RENDER
+# =====================================
+# Límites por gráfico o tabla para la vista de desarrollo (?dev=1, utils/instrumentation.py).
+# Los elementos que los superan se marcan con ⚠️.
+RENDER_BUDGET = {
+    'bytes': 500_000,  # Tamaño máximo del payload serializado
+    'ms': 100,  # Tiempo máximo de construcción + serialización
+}
@@ -1,10 +1,143 @@
+import functools
+import hashlib
+import json
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
 from pathlib import Path
 import streamlit as st
 
-@st.cache_data
-def load_data():
-    data_path = Path(__file__).parent.parent / 'data/titanic_combined.csv'
-    df = pd.read_csv(data_path)
+from utils.features import add_derived_features
+from utils.files import atomic_write
+
+# TITANIC_DATA permite servir otro CSV con el mismo esquema (p. ej. datos sintéticos
+# para pruebas de carga, benchmarks/load.py)
+DATA_PATH = Path(os.environ.get('TITANIC_DATA', Path(__file__).parent.parent / 'data/titanic_combined.csv'))
+
+# Copia en formato Arrow/Feather (sin compresión) que se mapea en memoria
+SNAPSHOT_PATH = DATA_PATH.with_suffix('.arrow')
+
+# Claves de los metadatos del snapshot: huella del CSV de origen y lotes de corrección
+# ya aplicados (utils/deltas.py)
+SNAPSHOT_SOURCE_KEY = b'titanic_source'
+SNAPSHOT_DELTAS_KEY = b'titanic_deltas'
+
+# Versiones del dataset en memoria y tiempo máximo (s) antes de volver a cargarlo.
+# Con 2 entradas la versión anterior sigue disponible mientras se carga la nueva.
+DATA_CACHE_ENTRIES = 2
+DATA_CACHE_TTL = 24 * 60 * 60
+
+
+# =====================================
+# ESQUEMA DEL DATASET COMBINADO
+# =====================================
+# Tipos explícitos para no dejar que pandas los infiera columna a columna:
+# - Categóricas para columnas con pocos valores distintos (se guardan como códigos enteros)
+# - Enteros pequeños (int8/int16) para contadores y clases
+# - float32 para edad y tarifa
+# - Booleanos reales para las columnas True/False
+# Name y Ticket (texto libre) quedan con el tipo de texto por defecto de pandas
+
+DTYPES = {
+    'PassengerId': 'int32',
+    'Survived': 'int8',
+    'Pclass': 'int8',
+    'Sex': 'category',
+    'Age': 'float32',
+    'SibSp': 'int8',
+    'Parch': 'int8',
+    'Fare': 'float32',
+    'Embarked': 'category',
+    'class': pd.CategoricalDtype(['First', 'Second', 'Third'], ordered=True),
+    'who': 'category',
+    'adult_male': 'bool',
+    'embark_town': 'category',
+    'alive': 'category',
+    'alone': 'bool',
+    'TITLE': 'category',
+    'GrupoFamiliar': 'int16',
+    'menorEdad': 'bool',
+}
+
+
+def read_combined_csv(path=DATA_PATH):
+    # Lectura con esquema fijo: sin inferencia de tipos y con booleanos reales
+    return pd.read_csv(
+        path,
+        dtype=DTYPES,
+        true_values=['True'],
+        false_values=['False'],
+    )
+
+
+# =====================================
+# SNAPSHOT ARROW COMPARTIDO
+# =====================================
+# El CSV se convierte una sola vez a Feather v2 sin compresión. Todas las sesiones
+# (y todos los procesos del mismo host) mapean el mismo archivo en memoria, así que
+# las páginas del sistema operativo se comparten en lugar de duplicar la tabla.
+
+def data_version(csv_path=DATA_PATH):
+    # Huella del contenido del archivo de datos. El hash solo se recalcula cuando cambian
+    # la fecha de modificación o el tamaño; un archivo reescrito con el mismo contenido
+    # conserva la huella (y todo lo cacheado con ella)
+    stat = csv_path.stat()
+    return _content_hash(csv_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _content_hash(csv_path, mtime_ns, size):
+    digest = hashlib.blake2b(digest_size=8)
+    with open(csv_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snapshot_metadata(snapshot_path):
+    # Solo se lee el esquema del archivo, no los datos
+    with pa.memory_map(str(snapshot_path)) as source:
+        return pa.ipc.open_file(source).schema.metadata or {}
+
+
+def snapshot_is_stale(csv_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH):
+    # El snapshot guarda la huella del CSV del que salió
+    if not snapshot_path.exists():
+        return True
+    return _snapshot_metadata(snapshot_path).get(SNAPSHOT_SOURCE_KEY, b'').decode() != data_version(csv_path)
+
+
+def write_snapshot(df, snapshot_path=SNAPSHOT_PATH, source=None, deltas=()):
+    # source: huella del CSV de origen; deltas: lotes de corrección incluidos en df
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({
+        **table.schema.metadata,
+        SNAPSHOT_SOURCE_KEY: (source or data_version()).encode(),
+        SNAPSHOT_DELTAS_KEY: json.dumps(list(deltas)).encode(),
+    })
+    with atomic_write(snapshot_path) as tmp_path:
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_PATH):
+    # memory_map=True: las columnas numéricas sin nulos quedan como vistas de solo lectura
+    # sobre el archivo mapeado (split_blocks evita consolidarlas en un bloque nuevo)
+    table = feather.read_table(snapshot_path, memory_map=True)
+    df = table.to_pandas(split_blocks=True)
+    df.attrs['deltas'] = json.loads(table.schema.metadata.get(SNAPSHOT_DELTAS_KEY, b'[]'))
     return df
 
+
+@st.cache_resource(max_entries=DATA_CACHE_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def load_data(version):
+    # Un único DataFrame de solo lectura por versión del CSV, compartido por todas las sesiones.
+    # version (data_version()) solo sirve de clave: un CSV con contenido nuevo es otra entrada.
+    # Las variables derivadas se añaden aquí una sola vez; las páginas no lo modifican.
+    if snapshot_is_stale():
+        try:
+            write_snapshot(read_combined_csv(), source=version)
+        except OSError:
+            # Directorio de datos sin permisos de escritura: se sirve el CSV directamente
+            return add_derived_features(read_combined_csv())
+    return add_derived_features(read_snapshot())
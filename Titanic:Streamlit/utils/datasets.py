@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.aggregates import build_survival_cube
+from utils.cache import count_call, count_miss
+from utils.data_loader import DATA_PATH, DTYPES, data_version
+from utils.deltas import current_dataset
+from utils.etl import DATA_DIR, RENAME_COLUMNS
+from utils.features import add_derived_features, who_columns
+from utils.text_features import titles
+
+
+# =====================================
+# REGISTRO DE DATASETS
+# =====================================
+# Cada fuente de data/ se describe con su archivo, su esquema de lectura y cómo se
+# lleva al esquema de titanic_combined.csv (el que esperan las páginas):
+# - 'rename': renombrado de columnas
+# - 'normalize': columnas que faltan y se derivan de las que hay
+# Los datasets se cargan la primera vez que se eligen y se cachean por separado
+# (clave: nombre + huella del archivo), así que cambiar de uno a otro no recarga
+# los que ya están en memoria.
+
+# Columnas de titanic_combined.csv en su orden
+COMBINED_COLUMNS = [
+    'PassengerId', 'Survived', 'Pclass', 'Name', 'Sex', 'Age', 'SibSp', 'Parch', 'Ticket',
+    'Fare', 'Embarked', 'class', 'who', 'adult_male', 'embark_town', 'alive', 'alone',
+    'TITLE', 'GrupoFamiliar', 'menorEdad',
+]
+
+# Columnas que se conservan si la fuente las trae (las usan las variables de texto de
+# utils/text_features.py); el CSV combinado no tiene Cabin
+OPTIONAL_COLUMNS = ['Cabin']
+
+CLASS_NAMES = {1: 'First', 2: 'Second', 3: 'Third'}
+EMBARK_TOWNS = {'C': 'Cherbourg', 'Q': 'Queenstown', 'S': 'Southampton'}
+
+# Fuentes distintas del dataset combinado en memoria a la vez (se descartan las menos usadas)
+DATASET_CACHE_ENTRIES = 2
+
+
+def _family_columns(df):
+    family = df['SibSp'] + df['Parch']
+    return {
+        'GrupoFamiliar': family,
+        'alone': family == 0,
+        'menorEdad': df['Age'] < 18,
+    }
+
+
+def normalize_kaggle(df):
+    # Titanic-Dataset.csv: tiene nombres (y por tanto títulos) pero no las columnas de seaborn
+    return df.assign(
+        **{'class': df['Pclass'].map(CLASS_NAMES)},
+        **who_columns(df['Age'], df['Sex']),
+        embark_town=df['Embarked'].map(EMBARK_TOWNS),
+        alive=df['Survived'].map({0: 'no', 1: 'yes'}),
+        TITLE=titles(df['Name']),
+        **_family_columns(df),
+    )
+
+
+def normalize_seaborn(df):
+    # titanic.csv: sin identificador, nombre ni ticket; el título queda vacío y del
+    # camarote solo se conoce la cubierta
+    missing = pd.Series(pd.NA, index=df.index, dtype='str')
+    return df.assign(
+        PassengerId=np.arange(1, len(df) + 1),
+        Name=missing,
+        Ticket=missing,
+        TITLE=missing,
+        Cabin=df['deck'].astype('str'),
+        **_family_columns(df),
+    )
+
+
+DATASETS = {
+    'combinado': {
+        'label': "Titanic combinado",
+        'path': DATA_PATH,
+        # Se sirve desde el snapshot compartido con correcciones incrementales (utils/deltas.py)
+    },
+    'kaggle': {
+        'label': "Titanic-Dataset (Kaggle)",
+        'path': DATA_DIR / 'Titanic-Dataset.csv',
+        'dtypes': {
+            'PassengerId': 'int32', 'Survived': 'int8', 'Pclass': 'int8', 'Sex': 'category',
+            'Age': 'float32', 'SibSp': 'int8', 'Parch': 'int8', 'Fare': 'float32', 'Embarked': 'category',
+        },
+        'rename': {},
+        'normalize': normalize_kaggle,
+    },
+    'seaborn': {
+        'label': "titanic.csv (seaborn)",
+        'path': DATA_DIR / 'titanic.csv',
+        'dtypes': {
+            'survived': 'int8', 'pclass': 'int8', 'sex': 'category', 'age': 'float32',
+            'sibsp': 'int8', 'parch': 'int8', 'fare': 'float32', 'embarked': 'category',
+        },
+        'rename': RENAME_COLUMNS,
+        'normalize': normalize_seaborn,
+    },
+}
+
+DEFAULT_DATASET = 'combinado'
+
+
+def read_dataset(name):
+    # Lee una fuente del registro y la devuelve con el esquema (y los tipos) del combinado
+    source = DATASETS[name]
+    df = pd.read_csv(source['path'], dtype=source['dtypes'], true_values=['True'], false_values=['False'])
+    df = source['normalize'](df.rename(columns=source['rename']))
+    return df[COMBINED_COLUMNS + [column for column in OPTIONAL_COLUMNS if column in df.columns]].astype(DTYPES)
+
+
+@st.cache_resource(max_entries=DATASET_CACHE_ENTRIES, show_spinner=False)
+def _load_source(name, version):
+    count_miss('fuentes')
+    df = add_derived_features(read_dataset(name))
+    return df, build_survival_cube(df, f"{name}:{version}")
+
+
+def load_dataset(name):
+    # Tabla y cubo del dataset elegido; el combinado es el de current_dataset()
+    if name == DEFAULT_DATASET:
+        return current_dataset()
+    count_call('fuentes')
+    return _load_source(name, data_version(DATASETS[name]['path']))
+
+
+# =====================================
+# SELECTOR (PANEL LATERAL Y URL)
+# =====================================
+
+def render_dataset_selector():
+    # El dataset inicial sale de ?dataset=... en la URL; el elegido se vuelve a escribir
+    # en la URL para poder compartir el enlace
+    names = list(DATASETS)
+    requested = st.query_params.get('dataset', DEFAULT_DATASET)
+    if requested not in DATASETS:
+        requested = DEFAULT_DATASET
+
+    name = st.sidebar.selectbox(
+        "📁 Dataset", names, index=names.index(requested),
+        format_func=lambda option: DATASETS[option]['label'], key='dataset'
+    )
+    if st.query_params.get('dataset') != name:
+        st.query_params['dataset'] = name
+    return name
@@ -0,0 +1,160 @@
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.aggregates import build_survival_cube, update_survival_cube
+from utils.cache import cached_result, count_call, count_miss
+from utils.data_loader import (
+    DATA_CACHE_ENTRIES, DATA_CACHE_TTL, DATA_PATH, data_version, load_data, read_combined_csv, write_snapshot,
+)
+from utils.features import DERIVED_COLUMNS, add_derived_features
+from utils.groups import GROUP_COLUMNS, travel_groups
+from utils.profile import dataset_profile, row_hashes, update_profile
+
+
+# =====================================
+# CORRECCIONES INCREMENTALES
+# =====================================
+# Los pasajeros nuevos o corregidos llegan como CSV pequeños en data/deltas/ con el
+# esquema de titanic_combined.csv. Se aplican en orden de nombre de archivo
+# (p. ej. 2026-10-18.csv) y cada uno solo una vez:
+# - Las filas se identifican por PassengerId (las repetidas en un lote: gana la última)
+# - Un hash de contenido por fila descarta las que no han cambiado
+# - El cubo y el perfil se actualizan restando las filas antiguas y sumando las nuevas
+# - Los grupos de viaje dependen de toda la tabla: se recalculan tras cada lote (coste
+#   casi lineal) y las filas cuyo grupo cambia también se restan y se suman
+# - El snapshot Arrow se reescribe con la lista de lotes aplicados en sus metadatos,
+#   así que al reiniciar no se vuelven a aplicar
+# Ni la tabla ni las estadísticas se recalculan desde cero.
+
+DELTA_DIR = DATA_PATH.parent / 'deltas'
+
+
+def pending_deltas(applied, delta_dir=DELTA_DIR):
+    if not delta_dir.is_dir():
+        return []
+    return sorted(path for path in delta_dir.glob('*.csv') if path.name not in applied)
+
+
+def dataset_fingerprint(version, applied):
+    # Versión del CSV base + lotes aplicados
+    if not applied:
+        return version
+    digest = hashlib.sha1('\n'.join(applied).encode()).hexdigest()[:12]
+    return f"{version}+{digest}"
+
+
+def align_categories(df, delta):
+    # Las categorías nuevas del lote se añaden a la tabla y el lote toma los tipos de la
+    # tabla (las categóricas ordenadas tienen categorías fijas y no se amplían)
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered:
+            new = pd.Index(delta[column].dropna().astype(object).unique()).difference(dtype.categories)
+            if len(new):
+                df[column] = df[column].cat.add_categories(new)
+    return df, delta.astype(df.dtypes.to_dict())
+
+
+def diff_delta(df, delta):
+    # Devuelve las posiciones de las filas corregidas, sus valores nuevos y las filas nuevas.
+    # Los grupos del lote se calculan solo con sus filas: no cuentan para decidir si cambió
+    delta = delta.drop_duplicates('PassengerId', keep='last')
+    positions = pd.Index(df['PassengerId']).get_indexer(delta['PassengerId'])
+    existing = positions >= 0
+    columns = df.columns.difference(GROUP_COLUMNS, sort=False)
+    old_hashes = row_hashes(df.iloc[positions[existing]][columns]).to_numpy()
+    new_hashes = row_hashes(delta[existing][columns]).to_numpy()
+    changed = old_hashes != new_hashes
+    return positions[existing][changed], delta[existing][changed], delta[~existing]
+
+
+def apply_delta(df, delta):
+    # Devuelve la tabla nueva y las filas que salen (removed) y entran (added)
+    # copy(deep=False): con copy-on-write solo se copian las columnas que se modifican
+    df = df.copy(deep=False)
+    df, delta = align_categories(df, add_derived_features(delta)[df.columns])
+    positions, corrected, new_rows = diff_delta(df, delta)
+
+    # Tabla antes del lote (con copy-on-write no se copia nada hasta que df cambia)
+    old = df.copy(deep=False)
+    for column in df.columns:
+        old_values = old[column].iloc[positions].reset_index(drop=True)
+        new_values = corrected[column].reset_index(drop=True)
+        if not old_values.equals(new_values):
+            df.iloc[positions, df.columns.get_loc(column)] = new_values.to_numpy()
+
+    if len(new_rows):
+        df = pd.concat([df, new_rows], ignore_index=True)
+
+    # Grupos de la tabla completa; salen y entran las filas corregidas, las nuevas y las
+    # que han cambiado de grupo
+    df = df.assign(**travel_groups(df)).astype(old.dtypes.to_dict())
+    changed = np.ones(len(df), dtype=bool)
+    changed[:len(old)] = (df['GroupId'].iloc[:len(old)].to_numpy() != old['GroupId'].to_numpy()) | (
+        df['GroupSize'].iloc[:len(old)].to_numpy() != old['GroupSize'].to_numpy()
+    )
+    changed[positions] = True
+    return df, old[changed[:len(old)]], df[changed]
+
+
+# =====================================
+# DATASET ACTUAL (COMPARTIDO POR TODAS LAS SESIONES)
+# =====================================
+
+# 'state' es una tupla (tabla, cubo, lotes aplicados) que no se modifica: al aplicar
+# lotes se sustituye entera en una sola asignación, así que quien la lee sin el lock
+# obtiene siempre una tabla y un cubo de la misma versión
+
+@st.cache_resource(max_entries=DATA_CACHE_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def _dataset_store(version):
+    # Solo llama a load_data al crear la entrada: el contador 'dataset' (aciertos y fallos
+    # por petición del dataset) es también el de la carga de datos
+    count_miss('dataset')
+    df = load_data(version)
+    applied = tuple(df.attrs.get('deltas', []))
+    return {
+        'lock': threading.Lock(),
+        'version': version,
+        'state': (df, build_survival_cube(df, dataset_fingerprint(version, applied)), applied),
+    }
+
+
+def _apply_pending(store, pending):
+    df, cube, applied = store['state']
+    profile = dataset_profile(df, cube)
+    applied = list(applied)
+    for path in pending:
+        applied.append(path.name)
+        df, removed, added = apply_delta(df, read_combined_csv(path))
+        cube = update_survival_cube(cube, added, removed, dataset_fingerprint(store['version'], applied))
+        profile = update_profile(profile, added, removed)
+    df.attrs['deltas'] = applied
+
+    # El perfil actualizado queda en la caché de resultados con la huella nueva
+    cached_result(cube, 'perfil', lambda: profile)
+    try:
+        write_snapshot(df.drop(columns=DERIVED_COLUMNS), source=store['version'], deltas=applied)
+    except OSError:
+        # Sin permisos de escritura: los lotes se vuelven a aplicar al reiniciar
+        pass
+    store['state'] = (df, cube, tuple(applied))
+
+
+def current_dataset():
+    # Tabla y cubo de la versión actual del CSV con todos los lotes de data/deltas/ aplicados
+    count_call('dataset')
+    store = _dataset_store(data_version())
+    df, cube, applied = store['state']
+    if pending_deltas(applied):
+        with store['lock']:
+            # Se vuelve a comprobar dentro del lock: otra sesión puede haberlos aplicado ya
+            df, cube, applied = store['state']
+            pending = pending_deltas(applied)
+            if pending:
+                _apply_pending(store, pending)
+                df, cube, applied = store['state']
+    return df, cube
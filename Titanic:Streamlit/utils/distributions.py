@@ -0,0 +1,79 @@
+import numpy as np
+
+
+# =====================================
+# RESÚMENES DE DISTRIBUCIONES EN EL SERVIDOR
+# =====================================
+# En lugar de enviar todos los valores al navegador (que calcula allí el KDE del
+# violín y su caja), se calcula aquí con NumPy un resumen de tamaño fijo: curva de
+# densidad, cuartiles y momentos. El tamaño de las trazas no depende
+# del número de filas.
+
+# Puntos de la curva de densidad
+KDE_POINTS = 256
+
+
+def silverman_bandwidth(values):
+    # Regla de Silverman (la misma que usa Plotly para los violines)
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    spread = min(values.std(ddof=1), (q3 - q1) / 1.349) or values.std(ddof=1)
+    return 1.059 * spread * len(values) ** (-1 / 5)
+
+
+def kde_curve(values, bandwidth, points=KDE_POINTS):
+    # KDE por binning: histograma fino (O(n)) convolucionado con un kernel gaussiano
+    # muestreado en la misma rejilla (O(puntos²) como mucho, independiente de n)
+    low = values.min() - 2 * bandwidth
+    high = values.max() + 2 * bandwidth
+    counts, edges = np.histogram(values, bins=points, range=(low, high))
+    step = edges[1] - edges[0]
+    centers = (edges[:-1] + edges[1:]) / 2
+
+    half = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel, mode='full')[half:half + points] / len(values)
+    return centers, density
+
+
+def box_stats(values):
+    # Cuartiles y bigotes al estilo Plotly (1.5 * IQR, recortados a los datos)
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': inside.min(),
+        'upperfence': inside.max(),
+    }
+
+
+def summarize_distribution(values):
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    count = len(values)
+    if count == 0:
+        return {'count': 0, 'mean': np.nan, 'median': np.nan, 'std': np.nan, 'grid': None, 'density': None}
+
+    summary = {
+        'count': count,
+        'mean': values.mean(),
+        # ddof=1 para coincidir con pandas (.std())
+        'std': values.std(ddof=1) if count > 1 else np.nan,
+        **box_stats(values),
+        'grid': None,
+        'density': None,
+    }
+    bandwidth = silverman_bandwidth(values) if count > 1 else 0
+    if bandwidth > 0:
+        summary['grid'], summary['density'] = kde_curve(values, bandwidth)
+    return summary
+
+
+def summarize_by_group(values, groups, keys):
+    # Un resumen por cada valor de 'groups' (p. ej. la edad de supervivientes y no supervivientes)
+    values = np.asarray(values, dtype='float64')
+    groups = np.asarray(groups)
+    return {key: summarize_distribution(values[groups == key]) for key in keys}
@@ -0,0 +1,125 @@
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils.files import atomic_write
+from utils.text_features import titles
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+# Uso desde la carpeta de la app:
+#   python -m utils.etl
+#   python -m utils.etl --chunksize 500000 --output data/titanic_combined.csv
+
+
+# =====================================
+# REGLAS DEL NOTEBOOK (EDA.titanic 1.ipynb)
+# =====================================
+
+# Renombrado de columnas de titanic.csv al formato de Titanic-Dataset.csv
+RENAME_COLUMNS = {
+    'survived': 'Survived',
+    'pclass': 'Pclass',
+    'sex': 'Sex',
+    'age': 'Age',
+    'sibsp': 'SibSp',
+    'parch': 'Parch',
+    'fare': 'Fare',
+    'embarked': 'Embarked',
+}
+
+# Columnas de titanic.csv que no existen en Titanic-Dataset.csv
+EXTRA_COLUMNS = ['class', 'who', 'adult_male', 'deck', 'embark_town', 'alive', 'alone']
+
+# Columnas que el notebook elimina antes de guardar
+DROP_COLUMNS = ['deck', 'Cabin']
+
+
+# =====================================
+# PRIMERA PASADA: ESTADÍSTICAS GLOBALES
+# =====================================
+# La moda de embarque y la media de edad por clase dependen de todo el archivo,
+# así que se acumulan por bloques antes de transformar.
+
+def collect_stats(titanic_path, dataset_path, chunksize):
+    embarked_counts = pd.Series(dtype='int64')
+    town_counts = pd.Series(dtype='int64')
+    for chunk in pd.read_csv(titanic_path, usecols=['embarked', 'embark_town'], chunksize=chunksize):
+        embarked_counts = embarked_counts.add(chunk['embarked'].value_counts(), fill_value=0)
+        town_counts = town_counts.add(chunk['embark_town'].value_counts(), fill_value=0)
+
+    age_sum = pd.Series(dtype='float64')
+    age_count = pd.Series(dtype='float64')
+    for chunk in pd.read_csv(dataset_path, usecols=['Pclass', 'Age'], chunksize=chunksize):
+        grouped = chunk.groupby('Pclass')['Age']
+        age_sum = age_sum.add(grouped.sum(), fill_value=0)
+        age_count = age_count.add(grouped.count(), fill_value=0)
+
+    return {
+        # idxmax sobre los conteos ordenados por índice = primera moda, como .mode()[0]
+        'embarked_mode': embarked_counts.sort_index().idxmax(),
+        'embark_town_mode': town_counts.sort_index().idxmax(),
+        'age_mean_by_class': age_sum / age_count,
+    }
+
+
+# =====================================
+# SEGUNDA PASADA: TRANSFORMACIÓN POR BLOQUES
+# =====================================
+
+def transform_chunk(raw, extra, stats):
+    extra = extra.rename(columns=RENAME_COLUMNS)
+    extra['Embarked'] = extra['Embarked'].fillna(stats['embarked_mode'])
+    extra['embark_town'] = extra['embark_town'].fillna(stats['embark_town_mode'])
+
+    # En el notebook el PassengerId de titanic.csv se asigna por posición y luego se
+    # une con Titanic-Dataset.csv; unir los bloques por índice es equivalente.
+    # Las columnas repetidas se toman de Titanic-Dataset.csv (sufijo '_drop' en el notebook).
+    combined = pd.concat([raw, extra[EXTRA_COLUMNS]], axis=1, join='inner')
+
+    # Patrón y agrupación de títulos del notebook (utils/text_features.py)
+    combined['TITLE'] = titles(combined['Name'])
+    combined['GrupoFamiliar'] = combined['SibSp'] + combined['Parch']
+    combined['Age'] = combined['Age'].fillna(combined['Pclass'].map(stats['age_mean_by_class']))
+    combined['menorEdad'] = combined['Age'] < 18
+
+    return combined.drop(columns=DROP_COLUMNS)
+
+
+def build_combined(titanic_path, dataset_path, output_path, chunksize=100_000):
+    stats = collect_stats(titanic_path, dataset_path, chunksize)
+
+    rows = 0
+    raw_chunks = pd.read_csv(dataset_path, chunksize=chunksize)
+    extra_chunks = pd.read_csv(titanic_path, chunksize=chunksize)
+    with atomic_write(output_path) as tmp_path:
+        for raw, extra in zip(raw_chunks, extra_chunks):
+            combined = transform_chunk(raw, extra, stats)
+            combined.to_csv(tmp_path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+            rows += len(combined)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Regenera titanic_combined.csv a partir de titanic.csv y Titanic-Dataset.csv"
+    )
+    parser.add_argument('--titanic', default=DATA_DIR / 'titanic.csv', type=Path,
+                        help="CSV con class/who/alive/... (formato seaborn)")
+    parser.add_argument('--dataset', default=DATA_DIR / 'Titanic-Dataset.csv', type=Path,
+                        help="CSV con PassengerId/Name/Ticket/... (formato Kaggle)")
+    parser.add_argument('--output', default=DATA_DIR / 'titanic_combined.csv', type=Path,
+                        help="Ruta del CSV combinado de salida")
+    parser.add_argument('--chunksize', default=100_000, type=int,
+                        help="Filas por bloque en lectura y escritura")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = build_combined(args.titanic, args.dataset, args.output, args.chunksize)
+    print(f"{rows:,} filas escritas en {args.output} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
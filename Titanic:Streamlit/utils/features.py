@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from utils.groups import GROUP_COLUMNS, travel_groups
+from utils.text_features import TEXT_COLUMNS, text_features
+
+
+# =====================================
+# VARIABLES DERIVADAS
+# =====================================
+# Se calculan una sola vez al cargar el dataset, con operaciones vectorizadas
+# (pd.cut en lugar de .apply por fila). Las páginas solo leen estas columnas.
+# Las variables de texto (apellido, billete, camarote) salen de utils/text_features.py
+# y los grupos de viaje (billete y apellido compartidos), de utils/groups.py.
+
+FAMILY_CATEGORIES = ['Solo', 'Pequeña (2-4)', 'Grande (5+)']
+
+AGE_BANDS = ['Niño (0-11)', 'Adolescente (12-17)', 'Adulto (18-59)', 'Mayor (60+)']
+AGE_BAND_EDGES = [0, 12, 18, 60, np.inf]
+
+# Tramos de edad de 5 años (el último tramo agrupa 75 años o más)
+AGE_BIN_WIDTH = 5
+AGE_BIN_EDGES = list(range(0, 80, AGE_BIN_WIDTH)) + [np.inf]
+
+# Tramos de tarifa fijos (cuartiles del dataset original) para que el tramo de un
+# pasajero no dependa del resto de filas cargadas
+FARE_BANDS = ['Baja', 'Media', 'Alta', 'Muy alta']
+FARE_BAND_EDGES = [0, 7.91, 14.454, 31, np.inf]
+
+# Edad por debajo de la cual titanic.csv considera 'child' a un pasajero
+CHILD_AGE = 16
+
+# Columnas que añade add_derived_features (no se guardan en el snapshot)
+DERIVED_COLUMNS = ['FamilySize', 'FamilyCategory', 'AgeBand', 'AgeBin', 'FareBand', *TEXT_COLUMNS, *GROUP_COLUMNS]
+
+
+def who_columns(age, sex):
+    # 'who' y 'adult_male' de titanic.csv (seaborn) para fuentes que no las traen
+    # (Titanic-Dataset.csv, datos sintéticos); edad desconocida cuenta como adulto
+    is_child = (age < CHILD_AGE).to_numpy(dtype=bool, na_value=False)
+    is_male = (sex == 'male').to_numpy(dtype=bool, na_value=False)
+    who = np.where(is_child, 'child', np.where(is_male, 'man', 'woman'))
+    return {'who': who, 'adult_male': who == 'man'}
+
+
+def family_size(df):
+    # +1 para incluir al pasajero
+    return (df['SibSp'] + df['Parch'] + 1).astype('int16')
+
+
+def family_category(size):
+    return pd.cut(size, bins=[0, 1, 4, np.inf], labels=FAMILY_CATEGORIES)
+
+
+def age_band(age):
+    return pd.cut(age, bins=AGE_BAND_EDGES, right=False, labels=AGE_BANDS)
+
+
+def age_bin(age):
+    return pd.cut(age, bins=AGE_BIN_EDGES, right=False, labels=AGE_BIN_EDGES[:-1])
+
+
+def fare_band(fare):
+    return pd.cut(fare, bins=FARE_BAND_EDGES, include_lowest=True, labels=FARE_BANDS)
+
+
+def add_derived_features(df):
+    # Devuelve un DataFrame nuevo; el de entrada no se modifica. Los grupos de viaje
+    # dependen de todas las filas recibidas (y del apellido), así que van después
+    size = family_size(df)
+    df = df.assign(
+        FamilySize=size,
+        FamilyCategory=family_category(size),
+        AgeBand=age_band(df['Age']),
+        AgeBin=age_bin(df['Age']),
+        FareBand=fare_band(df['Fare']),
+        **text_features(df),
+    )
+    return df.assign(**travel_groups(df))
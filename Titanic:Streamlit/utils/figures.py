@@ -0,0 +1,33 @@
+import streamlit as st
+
+from utils.cache import count_call, count_miss
+
+
+# =====================================
+# CACHÉ DE FIGURAS PLOTLY
+# =====================================
+# Las figuras se construyen una sola vez por huella de datos (versión del dataset
+# + filtros) y se reutilizan entre reruns, cambios de página y sesiones.
+# Las figuras cacheadas son compartidas: no se deben modificar después de construirlas.
+#
+# Cada página con figuras define figure_builders(data): nombre de la figura -> función
+# sin argumentos que la construye a partir de su objeto de resultado. Las usan la página
+# (a través de esta caché, que solo llama a la función si la figura no está), la
+# exportación sin servidor (utils/report.py) y benchmarks/compute.py.
+# Las funciones build_*_figure importan Plotly dentro de la función: arrancar la app o
+# abrir una página con las figuras ya en caché no paga la importación de Plotly.
+
+# Número máximo de figuras en memoria (se descartan las menos usadas)
+FIGURE_CACHE_SIZE = 128
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def _cached_figure(fingerprint, name, _build):
+    count_miss('figuras')
+    return _build()
+
+
+def cached_figure(cube, name, build):
+    # build: función sin argumentos que construye la figura (solo se llama si no está en caché)
+    count_call('figuras')
+    return _cached_figure(cube.attrs['fingerprint'], name, build)
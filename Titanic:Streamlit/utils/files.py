@@ -0,0 +1,23 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# =====================================
+# ESCRITURA ATÓMICA DE ARCHIVOS GENERADOS
+# =====================================
+# Los archivos que genera la app o sus scripts (CSV combinado, snapshot, modelo, datos
+# sintéticos) se escriben en un temporal junto al destino y se renombran al terminar:
+# os.replace es atómico, así que otro proceso (o la app) nunca lee un archivo a medias.
+# Si la escritura falla, el temporal se borra y el destino queda como estaba.
+
+@contextmanager
+def atomic_write(path):
+    # Uso: with atomic_write(ruta) as tmp_path: <escribir tmp_path>
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
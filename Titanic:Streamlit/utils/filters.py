@@ -0,0 +1,157 @@
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.aggregates import build_survival_cube
+from utils.cache import count_call, count_miss
+
+
+# =====================================
+# FILTROS GLOBALES
+# =====================================
+# Índices precalculados una vez por dataset:
+# - Bitmaps empaquetados (np.packbits) por cada valor de las columnas categóricas
+# - Orden de las filas por valor para los rangos numéricos (edad y tarifa)
+# Una combinación de filtros se resuelve con OR de bitmaps dentro de cada columna y
+# AND entre columnas, sin volver a comparar los valores del DataFrame en cada rerun.
+
+CATEGORY_FILTERS = {
+    'Pclass': 'Clase',
+    'Sex': 'Sexo',
+    'Embarked': 'Puerto de embarque',
+    'TITLE': 'Título',
+}
+
+RANGE_FILTERS = {
+    'Age': 'Edad',
+    'Fare': 'Tarifa',
+}
+
+TRAVEL_OPTIONS = {
+    'Todos': None,
+    'Solo': [True],
+    'Con familia': [False],
+}
+
+# Número máximo de combinaciones de filtros con vista y cubo en memoria
+FILTER_CACHE_SIZE = 32
+
+
+def build_filter_index(df):
+    bitmaps = {}
+    for column in [*CATEGORY_FILTERS, 'alone']:
+        codes, uniques = pd.factorize(df[column], sort=True)
+        # Un bitmap por valor distinto (los nulos, código -1, no se indexan)
+        bitmaps[column] = {
+            value: np.packbits(codes == code)
+            for code, value in enumerate(uniques.tolist())
+        }
+
+    ranges = {}
+    for column in RANGE_FILTERS:
+        values = df[column].to_numpy(dtype='float64')
+        # argsort deja los NaN al final, fuera de cualquier rango
+        order = np.argsort(values, kind='stable')
+        ranges[column] = (order, values[order])
+
+    return {'n': len(df), 'bitmaps': bitmaps, 'ranges': ranges}
+
+
+# Versión actual y anterior del dataset combinado + las otras fuentes del registro (utils/datasets.py)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _filter_index(fingerprint, _df):
+    count_miss('indice_filtros')
+    return build_filter_index(_df)
+
+
+def load_filter_index(df, cube):
+    # Un índice por versión de los datos (cambia al aplicar correcciones, utils/deltas.py)
+    count_call('indice_filtros')
+    return _filter_index(cube.attrs['fingerprint'], df)
+
+
+def range_limits(index, column):
+    _, sorted_values = index['ranges'][column]
+    return float(np.nanmin(sorted_values)), float(np.nanmax(sorted_values))
+
+
+def active_filters(index, filters):
+    # Descarta las selecciones que no filtran nada (todos los valores o el rango completo)
+    # para que dos estados equivalentes compartan la misma clave de caché
+    active = {}
+    for column, selected in filters['categories'].items():
+        if selected is not None and set(selected) != set(index['bitmaps'][column]):
+            active[column] = sorted(selected)
+    for column, (low, high) in filters['ranges'].items():
+        if (low, high) != range_limits(index, column):
+            active[column] = [low, high]
+    return active
+
+
+def resolve_mask(index, active):
+    n = index['n']
+    packed = np.full((n + 7) // 8, 0xFF, dtype=np.uint8)
+    for column, selected in active.items():
+        if column in index['bitmaps']:
+            bitmaps = index['bitmaps'][column]
+            column_bits = np.zeros_like(packed)
+            for value in selected:
+                column_bits |= bitmaps[value]
+        else:
+            order, sorted_values = index['ranges'][column]
+            low, high = selected
+            start = np.searchsorted(sorted_values, low, side='left')
+            stop = np.searchsorted(sorted_values, high, side='right')
+            in_range = np.zeros(n, dtype=bool)
+            in_range[order[start:stop]] = True
+            column_bits = np.packbits(in_range)
+        packed &= column_bits
+    return np.unpackbits(packed, count=n).astype(bool)
+
+
+def filter_key(active):
+    return json.dumps(active, sort_keys=True, default=str)
+
+
+@st.cache_resource(max_entries=FILTER_CACHE_SIZE, show_spinner=False)
+def _filtered_data(fingerprint, _df, _index, _active):
+    count_miss('vistas_filtradas')
+    view = _df[resolve_mask(_index, _active)]
+    return view, build_survival_cube(view, fingerprint)
+
+
+def apply_filters(df, cube, index, filters):
+    # Devuelve la vista filtrada y su cubo; sin filtros activos, los datos completos sin copias
+    active = active_filters(index, filters)
+    if not active:
+        return df, cube
+    fingerprint = f"{cube.attrs['fingerprint']}|{filter_key(active)}"
+    count_call('vistas_filtradas')
+    return _filtered_data(fingerprint, df, index, active)
+
+
+# =====================================
+# PANEL LATERAL
+# =====================================
+
+def render_filter_sidebar(index, scope):
+    # scope: nombre del dataset; cada dataset guarda su propia selección de filtros
+    st.sidebar.markdown("---")
+    st.sidebar.header("🔎 Filtros")
+
+    categories = {}
+    for column, label in CATEGORY_FILTERS.items():
+        options = list(index['bitmaps'][column])
+        categories[column] = st.sidebar.multiselect(label, options, default=options, key=f"filtro_{scope}_{column}")
+
+    travel = st.sidebar.radio("Viaja", list(TRAVEL_OPTIONS), horizontal=True, key=f"filtro_{scope}_alone")
+    categories['alone'] = TRAVEL_OPTIONS[travel]
+
+    ranges = {}
+    for column, label in RANGE_FILTERS.items():
+        low, high = range_limits(index, column)
+        ranges[column] = st.sidebar.slider(label, min_value=low, max_value=high, value=(low, high), key=f"filtro_{scope}_{column}")
+
+    return {'categories': categories, 'ranges': ranges}
@@ -0,0 +1,208 @@
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from utils.cache import cache_stats
+from utils.configuracion import RENDER_BUDGET
+from utils.figures import cached_figure
+
+
+# =====================================
+# INSTRUMENTACIÓN DE GRÁFICOS Y TABLAS
+# =====================================
+# Sustitutos de st.plotly_chart y st.dataframe para las páginas. Con el modo
+# desarrollo activo (?dev=1 en la URL o TITANIC_DEV=1) miden, por página y sección:
+# - el tamaño del payload serializado (JSON de Plotly / Arrow de la tabla)
+# - el tiempo de construcción (figura, si no estaba en caché)
+# - el tiempo de serialización y envío (la propia llamada de Streamlit)
+# Sin modo desarrollo llaman directamente a Streamlit, sin coste añadido.
+
+METRICS_KEY = 'render_metrics'
+SECTIONS_KEY = 'section_timings'
+RERUN_KEY = 'rerun_start'
+MEMORY_KEY = 'rerun_memory'
+
+# Ejecuciones de app.py cuya memoria se conserva en el panel
+MEMORY_HISTORY = 20
+
+
+def memory_tracing_enabled():
+    # tracemalloc afecta a todo el proceso (todas las sesiones): solo lo activa quien
+    # arranca el servidor, nunca un parámetro de la URL
+    return os.environ.get('TITANIC_DEV') == '1'
+
+
+def instrumentation_enabled():
+    return memory_tracing_enabled() or st.query_params.get('dev') == '1'
+
+
+def _record(name, kind, payload_bytes, build_ms, render_ms):
+    page, _, section = name.partition('/')
+    metrics = st.session_state.setdefault(METRICS_KEY, {})
+    metrics[name] = {
+        'Página': page,
+        'Sección': section,
+        'Tipo': kind,
+        'Bytes': payload_bytes,
+        'Construcción (ms)': build_ms,
+        'Serialización (ms)': render_ms,
+    }
+
+
+def _arrow_size(data):
+    table = pa.Table.from_pandas(pd.DataFrame(data), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def plotly_chart(cube, name, build, **kwargs):
+    # name: 'pagina/seccion' (también es la clave de la figura en utils/figures.py)
+    if not instrumentation_enabled():
+        return st.plotly_chart(cached_figure(cube, name, build), **kwargs)
+
+    start = time.perf_counter()
+    fig = cached_figure(cube, name, build)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    element = st.plotly_chart(fig, **kwargs)
+    render_ms = (time.perf_counter() - start) * 1000
+
+    _record(name, 'plotly_chart', len(fig.to_json().encode()), build_ms, render_ms)
+    return element
+
+
+def dataframe(name, data, **kwargs):
+    # Las tablas ya vienen calculadas en el objeto de resultado: solo se mide la serialización
+    if not instrumentation_enabled():
+        return st.dataframe(data, **kwargs)
+
+    start = time.perf_counter()
+    element = st.dataframe(data, **kwargs)
+    render_ms = (time.perf_counter() - start) * 1000
+
+    _record(name, 'dataframe', _arrow_size(data), 0.0, render_ms)
+    return element
+
+
+# =====================================
+# TIEMPO POR SECCIÓN Y MEMORIA POR EJECUCIÓN
+# =====================================
+# Cada página marca el final de sus secciones con SectionTimer.lap: el tiempo de una
+# sección es el transcurrido desde la marca anterior (cálculo, figuras y envío incluidos).
+# La memoria de cada ejecución de app.py se mide con tracemalloc entre begin_rerun y el
+# panel: memoria neta retenida y pico durante la ejecución. tracemalloc es de todo el
+# proceso (ralentiza todas las sesiones y con varias activas incluye lo que asignen las
+# demás), así que solo se activa con TITANIC_DEV=1; con ?dev=1 no se mide la memoria.
+
+class SectionTimer:
+    def __init__(self, page):
+        self.page = page
+        self.enabled = instrumentation_enabled()
+        self.start = time.perf_counter()
+
+    def lap(self, section):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        timings = st.session_state.setdefault(SECTIONS_KEY, {})
+        timings[f"{self.page}/{section}"] = {
+            'Página': self.page,
+            'Sección': section,
+            'Tiempo (ms)': (now - self.start) * 1000,
+        }
+        self.start = now
+
+
+def begin_rerun():
+    # Se llama al principio de app.py
+    if not memory_tracing_enabled():
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    st.session_state[RERUN_KEY] = (time.perf_counter(), current)
+
+
+def _end_rerun():
+    if RERUN_KEY not in st.session_state or not tracemalloc.is_tracing():
+        return
+    start, start_memory = st.session_state.pop(RERUN_KEY)
+    current, peak = tracemalloc.get_traced_memory()
+    history = st.session_state.setdefault(MEMORY_KEY, [])
+    history.append({
+        'Ejecución': history[-1]['Ejecución'] + 1 if history else 1,
+        'Tiempo (ms)': (time.perf_counter() - start) * 1000,
+        'Δ memoria (KB)': (current - start_memory) / 1024,
+        'Pico (KB)': (peak - start_memory) / 1024,
+    })
+    del history[:-MEMORY_HISTORY]
+
+
+# =====================================
+# VISTA DE DESARROLLO
+# =====================================
+
+def render_instrumentation_panel():
+    # Se dibuja al final de app.py; tras el rerun de un fragmento muestra las mediciones
+    # de la ejecución completa anterior para las secciones que no se han vuelto a dibujar
+    if not instrumentation_enabled():
+        return
+
+    _end_rerun()
+    _render_performance()
+
+    metrics = st.session_state.get(METRICS_KEY, {})
+    with st.sidebar.expander("🛠️ Coste de render", expanded=False):
+        if not metrics:
+            st.caption("Sin mediciones todavía.")
+            return
+
+        table = pd.DataFrame(list(metrics.values())).sort_values('Bytes', ascending=False)
+        over_bytes = table['Bytes'] > RENDER_BUDGET['bytes']
+        over_ms = table['Construcción (ms)'] + table['Serialización (ms)'] > RENDER_BUDGET['ms']
+        table.insert(0, '⚠️', (over_bytes | over_ms).map({True: '⚠️', False: ''}))
+
+        st.caption(
+            f"Presupuesto por elemento: {RENDER_BUDGET['bytes'] / 1000:,.0f} KB, "
+            f"{RENDER_BUDGET['ms']} ms"
+        )
+        st.dataframe(table.round(1), hide_index=True, use_container_width=True)
+
+        per_page = table.groupby('Página')['Bytes'].sum()
+        for page, total in per_page.items():
+            st.caption(f"{page}: {total / 1000:,.1f} KB en total")
+
+
+def _render_performance():
+    with st.sidebar.expander("⏱️ Rendimiento", expanded=False):
+        timings = st.session_state.get(SECTIONS_KEY, {})
+        if timings:
+            st.markdown("**Tiempo por sección**")
+            table = pd.DataFrame(list(timings.values()))
+            st.dataframe(table.round(1), hide_index=True, use_container_width=True)
+
+        st.markdown("**Cachés del proceso**")
+        stats = pd.DataFrame.from_dict(cache_stats(), orient='index', columns=['calls', 'misses'])
+        stats = stats.rename(columns={'calls': 'Llamadas', 'misses': 'Fallos'}).rename_axis('Caché')
+        stats['Aciertos'] = stats['Llamadas'] - stats['Fallos']
+        stats['% aciertos'] = (100 * stats['Aciertos'] / stats['Llamadas']).round(1)
+        st.dataframe(stats.reset_index(), hide_index=True, use_container_width=True)
+        st.caption("dataset: cada petición del dataset actual; un fallo es una carga con load_data "
+                   "(snapshot o CSV y lotes de corrección).")
+
+        history = st.session_state.get(MEMORY_KEY, [])
+        if history:
+            st.markdown("**Memoria por ejecución (tracemalloc)**")
+            st.dataframe(pd.DataFrame(history[::-1]).round(1), hide_index=True, use_container_width=True)
+            st.caption("Δ memoria: retenida al terminar la ejecución. Pico: máximo durante la ejecución. "
+                       "Incluye lo que asignen otras sesiones del mismo proceso.")
+        elif not memory_tracing_enabled():
+            st.caption("Memoria por ejecución: arranca el servidor con TITANIC_DEV=1 para medirla con tracemalloc.")
@@ -0,0 +1,244 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.cache import count_call, count_miss
+from utils.data_loader import DATA_PATH, data_version, read_combined_csv
+from utils.deltas import current_dataset
+from utils.files import atomic_write
+
+# Uso desde la carpeta de la app:
+#   python -m utils.model train
+#   python -m utils.model score --input data/titanic_synthetic.csv --output /tmp/scores.csv
+
+
+# =====================================
+# MODELO DE SUPERVIVENCIA
+# =====================================
+# Regresión logística con NumPy (Newton-Raphson con regularización L2) sobre Pclass,
+# Sex, Age, Fare, TITLE, GrupoFamiliar y Embarked. Se entrena una vez por versión de
+# los datos, se guarda en data/survival_model.json y todas las sesiones comparten el
+# mismo modelo cargado. La puntuación es una multiplicación de matrices por bloques:
+# no hay bucles en Python por pasajero.
+
+MODEL_PATH = DATA_PATH.with_name('survival_model.json')
+
+CATEGORICAL_FEATURES = ['Pclass', 'Sex', 'TITLE', 'Embarked']
+NUMERIC_FEATURES = ['Age', 'Fare', 'GrupoFamiliar']
+# Tarifa muy asimétrica: se usa log(1 + Fare)
+LOG_FEATURES = ['Fare']
+
+L2_PENALTY = 1.0
+MAX_ITERATIONS = 50
+# Parte del dataset reservada para medir la precisión (el modelo final usa todas las filas)
+VALIDATION_FRACTION = 0.2
+# Filas máximas para entrenar (muestra aleatoria en datasets grandes)
+MAX_TRAIN_ROWS = 500_000
+SEED = 0
+
+SCORE_CHUNKSIZE = 250_000
+
+
+def _numeric_values(df, column):
+    values = df[column].to_numpy(dtype='float64')
+    return np.log1p(values) if column in LOG_FEATURES else values
+
+
+def design_matrix(model, df):
+    # Numéricas: nulos con la mediana de entrenamiento y estandarizadas.
+    # Categóricas: una columna 0/1 por categoría salvo la primera (la de referencia);
+    # valores desconocidos quedan en la referencia.
+    columns = []
+    for column, (fill, mean, std) in model['numeric'].items():
+        values = _numeric_values(df, column)
+        values = np.where(np.isnan(values), fill, values)
+        columns.append((values - mean) / std)
+    for column, categories in model['categories'].items():
+        codes = pd.Categorical(df[column], categories=categories).codes
+        columns.append((codes[:, None] == np.arange(1, len(categories))).astype('float64'))
+    return np.column_stack(columns)
+
+
+def model_columns(model):
+    # Columnas que necesita design_matrix
+    return list(model['numeric']) + list(model['categories'])
+
+
+def feature_names(model):
+    names = list(model['numeric'])
+    for column, categories in model['categories'].items():
+        names += [f"{column}={category}" for category in categories[1:]]
+    return names
+
+
+def _fit(X, y):
+    # Newton-Raphson (IRLS); la constante (primera columna) no se penaliza
+    X = np.column_stack([np.ones(len(X)), X])
+    penalty = np.full(X.shape[1], L2_PENALTY)
+    penalty[0] = 0
+    weights = np.zeros(X.shape[1])
+    for _ in range(MAX_ITERATIONS):
+        p = 1 / (1 + np.exp(-X @ weights))
+        gradient = X.T @ (y - p) - penalty * weights
+        hessian = (X * (p * (1 - p))[:, None]).T @ X + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        weights += step
+        if np.abs(step).max() < 1e-8:
+            break
+    return weights
+
+
+def train_model(df, fingerprint):
+    rng = np.random.default_rng(SEED)
+    if len(df) > MAX_TRAIN_ROWS:
+        df = df.iloc[np.sort(rng.choice(len(df), MAX_TRAIN_ROWS, replace=False))]
+
+    model = {
+        'fingerprint': fingerprint,
+        'numeric': {},
+        'categories': {
+            column: sorted(df[column].dropna().unique().tolist())
+            for column in CATEGORICAL_FEATURES
+        },
+    }
+    for column in NUMERIC_FEATURES:
+        values = _numeric_values(df, column)
+        fill = float(np.nanmedian(values))
+        values = np.where(np.isnan(values), fill, values)
+        model['numeric'][column] = [fill, float(values.mean()), float(values.std()) or 1.0]
+
+    X = design_matrix(model, df)
+    y = df['Survived'].to_numpy(dtype='float64')
+
+    # Precisión sobre una parte reservada y modelo final con todas las filas
+    validation = rng.random(len(df)) < VALIDATION_FRACTION
+    weights = _fit(X[~validation], y[~validation])
+    predicted = (X[validation] @ weights[1:] + weights[0]) > 0
+    model['accuracy'] = float((predicted == y[validation].astype(bool)).mean())
+
+    weights = _fit(X, y)
+    model['bias'] = float(weights[0])
+    model['weights'] = weights[1:].tolist()
+    model['rows'] = len(df)
+    return model
+
+
+def save_model(model, path=MODEL_PATH):
+    with atomic_write(path) as tmp_path:
+        tmp_path.write_text(json.dumps(model, indent=1, default=str))
+
+
+def read_model(path=MODEL_PATH):
+    return json.loads(path.read_text())
+
+
+def load_or_train(df, fingerprint, path=MODEL_PATH):
+    # Se reutiliza el modelo guardado si se entrenó con la misma versión de los datos
+    if path.exists():
+        model = read_model(path)
+        if model['fingerprint'] == fingerprint:
+            return model
+    model = train_model(df, fingerprint)
+    try:
+        save_model(model, path)
+    except OSError:
+        # Sin permisos de escritura: el modelo vive solo en memoria
+        pass
+    return model
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _shared_model(fingerprint, _df):
+    count_miss('modelo')
+    return load_or_train(_df, fingerprint)
+
+
+def load_survival_model():
+    # El modelo se entrena con el dataset completo (sin los filtros del panel lateral)
+    df, cube = current_dataset()
+    count_call('modelo')
+    return _shared_model(cube.attrs['fingerprint'], df)
+
+
+# =====================================
+# PUNTUACIÓN POR LOTES
+# =====================================
+
+def score(model, df, chunksize=SCORE_CHUNKSIZE):
+    # Probabilidad de supervivencia de cada fila; por bloques para acotar la memoria
+    # de la matriz de diseño
+    weights = np.asarray(model['weights'])
+    probabilities = np.empty(len(df))
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        logits = design_matrix(model, chunk) @ weights + model['bias']
+        probabilities[start:start + chunksize] = 1 / (1 + np.exp(-logits))
+    return probabilities
+
+
+def score_csv(model, source, chunksize=SCORE_CHUNKSIZE):
+    # Lee un CSV (ruta o archivo subido) por bloques y añade la columna 'Probabilidad'.
+    # ValueError si faltan columnas del modelo (o el archivo no es un CSV legible)
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        missing = [column for column in model_columns(model) if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"faltan columnas del modelo: {', '.join(missing)}")
+        chunk['Probabilidad'] = score(model, chunk, chunksize)
+        yield chunk
+
+
+def write_scores(model, source, target, chunksize=SCORE_CHUNKSIZE, preview_rows=0):
+    # Puntúa el CSV por bloques y escribe cada bloque en target (archivo binario abierto
+    # o BytesIO) sin juntar el resultado en memoria. Devuelve filas, probabilidad media
+    # y las primeras preview_rows filas puntuadas
+    rows, total, preview = 0, 0.0, []
+    for chunk in score_csv(model, source, chunksize):
+        chunk.to_csv(target, header=rows == 0, index=False)
+        if rows < preview_rows:
+            preview.append(chunk.head(preview_rows - rows))
+        rows += len(chunk)
+        total += chunk['Probabilidad'].sum()
+    preview = pd.concat(preview, ignore_index=True) if preview else pd.DataFrame()
+    return rows, total / rows if rows else float('nan'), preview
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Entrena o aplica el modelo de supervivencia")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train = commands.add_parser('train', help="Entrena el modelo y lo guarda en data/")
+    train.add_argument('--data', default=DATA_PATH, type=Path, help="CSV de entrenamiento")
+    train.add_argument('--output', default=MODEL_PATH, type=Path, help="Ruta del modelo")
+
+    scoring = commands.add_parser('score', help="Puntúa un CSV con el modelo guardado")
+    scoring.add_argument('--input', required=True, type=Path, help="CSV con las columnas del modelo")
+    scoring.add_argument('--output', required=True, type=Path, help="CSV de salida con 'Probabilidad'")
+    scoring.add_argument('--model', default=MODEL_PATH, type=Path, help="Ruta del modelo")
+    scoring.add_argument('--chunksize', default=SCORE_CHUNKSIZE, type=int, help="Filas por bloque")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == 'train':
+        df = read_combined_csv(args.data)
+        # Misma huella que usa la app para esa versión del CSV (sin lotes de corrección)
+        model = train_model(df, data_version(args.data))
+        save_model(model, args.output)
+        print(f"Modelo entrenado con {model['rows']:,} filas | precisión {model['accuracy']:.1%} | {args.output}")
+    else:
+        model = read_model(args.model)
+        with atomic_write(args.output) as tmp_path, open(tmp_path, 'wb') as target:
+            try:
+                rows, _, _ = write_scores(model, args.input, target, args.chunksize)
+            except ValueError as error:
+                parser.error(f"{args.input}: {error}")
+        print(f"{rows:,} filas puntuadas en {args.output}")
+    print(f"({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
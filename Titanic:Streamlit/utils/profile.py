@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cached_result
+from utils.features import DERIVED_COLUMNS
+
+
+# =====================================
+# PERFIL DEL DATASET
+# =====================================
+# Recuentos que necesitan recorrer todas las filas (duplicados, nulos, cardinalidades,
+# tipos, mínimos/máximos) calculados una sola vez por huella de datos (versión del
+# dataset + filtros) y compartidos por todas las páginas.
+# Solo se perfilan las columnas del dataset: las variables derivadas (utils/features.py)
+# son internas y no cuentan como variables analizadas.
+# Se guardan como conteos (hash de fila -> repeticiones, valor -> repeticiones por
+# columna) para poder sumar y restar filas sin recorrer de nuevo la tabla (utils/deltas.py).
+
+@dataclass(frozen=True)
+class DatasetProfile:
+    rows: int
+    columns: int
+    duplicates: int
+    # Nulos y valores distintos por columna
+    nulls: pd.Series
+    cardinality: pd.Series
+    # Columnas por grupo de tipo: 'numeric', 'bool' y 'categorical' (categóricas y texto)
+    dtype_groups: dict
+    # Mínimo, máximo y media de las columnas numéricas
+    numeric_summary: pd.DataFrame
+    # Conteos de los que se derivan los campos anteriores
+    row_hash_counts: pd.Series
+    value_counts: dict
+
+
+def row_hashes(df):
+    # Hash de contenido de cada fila (mismo valor => mismo hash, sin depender del índice)
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def _value_counts(series):
+    counts = series.value_counts(sort=False)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Índice con los valores, no con la categórica: así se pueden sumar conteos de
+        # tablas con categorías distintas (las categorías sin filas se descartan)
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+    return counts
+
+
+def _add_counts(counts, added, removed):
+    counts = counts.add(added, fill_value=0).sub(removed, fill_value=0)
+    return counts[counts > 0].astype('int64')
+
+
+def _numeric_summary(counts):
+    # Mínimo, máximo y media a partir de valor -> repeticiones (NaN si la columna no
+    # tiene valores)
+    if not counts.sum():
+        return {'min': np.nan, 'max': np.nan, 'mean': np.nan}
+    values = counts.index.to_numpy(dtype='float64')
+    return {'min': values.min(), 'max': values.max(), 'mean': (values * counts).sum() / counts.sum()}
+
+
+def _profile_from_counts(columns, dtype_groups, nulls, row_hash_counts, value_counts):
+    rows = int(row_hash_counts.sum())
+    numeric_summary = pd.DataFrame({
+        column: _numeric_summary(value_counts[column]) for column in dtype_groups['numeric']
+    }).T
+    return DatasetProfile(
+        rows=rows,
+        columns=len(columns),
+        duplicates=rows - len(row_hash_counts),
+        nulls=nulls,
+        cardinality=pd.Series({column: len(value_counts[column]) for column in columns}),
+        dtype_groups=dtype_groups,
+        numeric_summary=numeric_summary,
+        row_hash_counts=row_hash_counts,
+        value_counts=value_counts,
+    )
+
+
+def build_profile(df):
+    df = df.drop(columns=DERIVED_COLUMNS, errors='ignore')
+    dtype_groups = {
+        'numeric': list(df.select_dtypes(include=[np.number]).columns),
+        'bool': list(df.select_dtypes(include=['bool']).columns),
+        'categorical': list(df.select_dtypes(exclude=[np.number, 'bool']).columns),
+    }
+    return _profile_from_counts(
+        list(df.columns),
+        dtype_groups,
+        nulls=df.isna().sum(),
+        row_hash_counts=row_hashes(df).value_counts(sort=False),
+        value_counts={column: _value_counts(df[column]) for column in df.columns},
+    )
+
+
+def update_profile(profile, added, removed):
+    # Perfil de (tabla - removed + added) a partir del perfil anterior: solo se recorren las
+    # filas que cambian
+    columns = list(profile.nulls.index)
+    return _profile_from_counts(
+        columns,
+        profile.dtype_groups,
+        nulls=profile.nulls + added[columns].isna().sum() - removed[columns].isna().sum(),
+        row_hash_counts=_add_counts(
+            profile.row_hash_counts,
+            row_hashes(added[columns]).value_counts(sort=False),
+            row_hashes(removed[columns]).value_counts(sort=False),
+        ),
+        value_counts={
+            column: _add_counts(profile.value_counts[column], _value_counts(added[column]), _value_counts(removed[column]))
+            for column in columns
+        },
+    )
+
+
+def dataset_profile(df, cube):
+    return cached_result(cube, 'perfil', lambda: build_profile(df))
@@ -0,0 +1,168 @@
+import argparse
+import importlib
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.aggregates import build_survival_cube
+from utils.configuracion import PAGES
+from utils.data_loader import read_combined_csv
+from utils.datasets import DATASETS, DEFAULT_DATASET, read_dataset
+from utils.deltas import current_dataset
+from utils.features import add_derived_features
+
+# Uso desde la carpeta de la app (sin servidor de Streamlit):
+#   python -m utils.report --output /tmp/informes
+#   python -m utils.report --by Pclass --by Embarked --workers 8 --output /tmp/informes
+#   python -m utils.report --dataset kaggle --pages Resultados --format json --output /tmp/informes
+
+
+# =====================================
+# INFORMES POR LOTES
+# =====================================
+# Ejecuta los compute_* de las páginas y construye sus figuras (figure_builders) fuera
+# de Streamlit, una vez por porción de los datos (--by: un informe por cada combinación
+# de valores, p. ej. por clase o por puerto). Cada porción se procesa en un proceso del
+# pool: los procesos cargan el dataset una sola vez al arrancar y solo reciben la
+# combinación de valores que les toca. Salida por porción:
+# - <porción>/informe.html: todas las figuras en una página (plotly.js desde CDN)
+# - <porción>/informe.json: las figuras en JSON de Plotly, por 'página/figura'
+
+DEFAULT_PAGES = ['Resultados', 'Conclusiones']
+FORMATS = ['html', 'json']
+
+# Nombre de la carpeta del informe con todos los datos (sin --by)
+ALL_SLICE = 'todos'
+
+# Estado de cada proceso del pool (se rellena en _init_worker)
+_worker = {}
+
+
+def read_source(dataset, data=None):
+    # data: CSV con el esquema de titanic_combined.csv (p. ej. datos sintéticos), tal cual.
+    # El combinado es el mismo que sirven la app y la API: snapshot con los lotes de
+    # corrección de data/deltas/ aplicados (utils/deltas.py)
+    if data is not None:
+        return add_derived_features(read_combined_csv(data))
+    if dataset == DEFAULT_DATASET:
+        df, _ = current_dataset()
+        return df
+    return add_derived_features(read_dataset(dataset))
+
+
+def slice_keys(df, by):
+    # Combinaciones de valores presentes en los datos, en el orden de las categorías
+    if not by:
+        return [()]
+    groups = df.groupby(by, observed=True).size()
+    return [key if isinstance(key, tuple) else (key,) for key in groups.index]
+
+
+def slice_name(by, key):
+    if not by:
+        return ALL_SLICE
+    name = '_'.join(f"{column}={value}" for column, value in zip(by, key))
+    return re.sub(r'[^\w=.-]+', '-', name)
+
+
+def select_slice(df, by, key):
+    if not by:
+        return df
+    mask = True
+    for column, value in zip(by, key):
+        mask = mask & (df[column] == value)
+    return df[mask]
+
+
+def build_report(df, fingerprint, pages):
+    # Figuras de cada página: {'Resultados/dashboard': figura, ...}
+    cube = build_survival_cube(df, fingerprint)
+    figures = {}
+    for page in pages:
+        module_name, _, compute_name = PAGES[page]
+        module = importlib.import_module(module_name)
+        data = getattr(module, compute_name)(df, cube)
+        for name, build in module.figure_builders(data).items():
+            figures[f"{page}/{name}"] = build()
+    return figures
+
+
+def write_html(figures, title, path):
+    # plotly.js se incluye una sola vez (la primera figura) y desde CDN
+    parts = [
+        figure.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False)
+        for i, figure in enumerate(figures.values())
+    ]
+    sections = '\n'.join(
+        f"<h2>{name}</h2>\n{part}" for name, part in zip(figures, parts)
+    )
+    path.write_text(
+        f"<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>{title}</title></head>\n"
+        f"<body>\n<h1>{title}</h1>\n{sections}\n</body>\n</html>\n",
+        encoding='utf-8',
+    )
+
+
+def write_json(figures, title, path):
+    from plotly.io.json import to_json_plotly
+
+    path.write_text(to_json_plotly({'title': title, 'figures': figures}), encoding='utf-8')
+
+
+def _init_worker(dataset, data):
+    _worker['df'] = read_source(dataset, data)
+
+
+def render_slice(by, key, pages, formats, output):
+    df = select_slice(_worker['df'], by, key)
+    name = slice_name(by, key)
+    start = time.perf_counter()
+    figures = build_report(df, f"informe:{name}", pages)
+
+    folder = output / name
+    folder.mkdir(parents=True, exist_ok=True)
+    title = f"Titanic — {name} ({len(df):,} pasajeros)"
+    if 'html' in formats:
+        write_html(figures, title, folder / 'informe.html')
+    if 'json' in formats:
+        write_json(figures, title, folder / 'informe.json')
+    return name, len(figures), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta las figuras de las páginas a HTML/JSON sin servidor")
+    parser.add_argument('--output', required=True, type=Path, help="Carpeta de salida (una subcarpeta por porción)")
+    parser.add_argument('--dataset', default=DEFAULT_DATASET, choices=list(DATASETS), help="Dataset del registro (combinado: con los lotes de data/deltas/ aplicados, como en la app)")
+    parser.add_argument('--data', type=Path, help="CSV con el esquema de titanic_combined.csv (en lugar de --dataset; sin lotes de corrección)")
+    parser.add_argument('--pages', nargs='+', default=DEFAULT_PAGES, choices=list(PAGES), help="Páginas a exportar")
+    parser.add_argument('--by', action='append', default=[], help="Columna por la que partir los datos (repetible)")
+    parser.add_argument('--format', nargs='+', default=FORMATS, choices=FORMATS, dest='formats', help="Formatos de salida")
+    parser.add_argument('--workers', default=os.cpu_count(), type=int, help="Procesos en paralelo")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df = read_source(args.dataset, args.data)
+    unknown = [column for column in args.by if column not in df.columns]
+    if unknown:
+        parser.error(f"columnas desconocidas en --by: {', '.join(unknown)}")
+    keys = slice_keys(df, args.by)
+    del df
+
+    with ProcessPoolExecutor(
+        max_workers=min(args.workers, len(keys)), initializer=_init_worker, initargs=(args.dataset, args.data)
+    ) as pool:
+        futures = [
+            pool.submit(render_slice, args.by, key, args.pages, args.formats, args.output)
+            for key in keys
+        ]
+        for future in futures:
+            name, figures, seconds = future.result()
+            print(f"{name:<40}{figures:>4} figuras {seconds:>8.2f}s")
+
+    print(f"{len(keys)} informes en {args.output} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
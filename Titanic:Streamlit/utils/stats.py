@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregates import rates
+
+
+# =====================================
+# INTERVALOS DE CONFIANZA Y CONTRASTES
+# =====================================
+# Todo se calcula a partir del cubo de supervivencia (conteos por grupo), no de las filas.
+# Remuestrear con reemplazo los n pasajeros de un grupo y contar supervivientes equivale
+# a sacar un valor de una Binomial(n, supervivientes/n): las remuestras de todos los
+# grupos salen de una sola llamada a rng.binomial sobre una matriz grupos x remuestras,
+# y el coste no depende del número de filas del dataset.
+
+BOOTSTRAP_RESAMPLES = 10_000
+CONFIDENCE = 0.95
+
+# Semilla fija: los intervalos de una misma versión de datos no cambian entre sesiones
+BOOTSTRAP_SEED = 0
+
+SIGNIFICANCE_LEVEL = 0.05
+
+
+def bootstrap_intervals(table, resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE, seed=BOOTSTRAP_SEED):
+    # table: salida de rates() (columnas 'n' y 'survivors'); devuelve la misma tabla con
+    # los límites 'low' y 'high' del intervalo percentil de la tasa (NaN en grupos vacíos)
+    n = table['n'].to_numpy(dtype='int64')
+    survivors = table['survivors'].to_numpy(dtype='int64')
+    observed = np.divide(survivors, n, out=np.zeros(len(n)), where=n > 0)
+
+    rng = np.random.default_rng(seed)
+    resampled = rng.binomial(n[:, None], observed[:, None], size=(len(n), resamples))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        resampled_rates = resampled / n[:, None]
+
+    alpha = 1 - confidence
+    low, high = np.quantile(resampled_rates, [alpha / 2, 1 - alpha / 2], axis=1)
+    table = table.copy()
+    table['low'] = np.where(n > 0, low, np.nan)
+    table['high'] = np.where(n > 0, high, np.nan)
+    return table
+
+
+def format_interval(low, high):
+    if np.isnan(low):
+        return "—"
+    return f"{low:.1%} – {high:.1%}"
+
+
+def format_rate(value, spec='.1%', suffix='', missing="—"):
+    # Tasas (y diferencias o cocientes de tasas) de grupos vacíos son NaN: los filtros
+    # pueden dejar sin pasajeros un sexo o una clase. Se muestran como 'missing'
+    # (None para quitar el delta de st.metric)
+    if np.isnan(value):
+        return missing
+    return f"{value:{spec}}{suffix}"
+
+
+def rate_ratio(numerator, denominator):
+    # Cociente entre dos tasas; NaN si falta alguna o el denominador es 0
+    if np.isnan(numerator) or np.isnan(denominator) or denominator == 0:
+        return np.nan
+    return numerator / denominator
+
+
+# =====================================
+# CHI-CUADRADO DE INDEPENDENCIA
+# =====================================
+
+def _upper_gamma_regularized(a, x):
+    # Q(a, x) = Γ(a, x) / Γ(a): serie para x < a + 1 y fracción continua (Lentz) en el resto
+    if x <= 0:
+        return 1.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        k = a
+        while abs(term) > abs(total) * 1e-15:
+            k += 1
+            term *= x / k
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        step = d * c
+        h *= step
+        if abs(step - 1) < 1e-15:
+            break
+    return math.exp(log_prefactor) * h
+
+
+def chi2_sf(statistic, dof):
+    # P(X >= statistic) para una chi-cuadrado con dof grados de libertad
+    return _upper_gamma_regularized(dof / 2, statistic / 2)
+
+
+def chi_square_test(cube, by):
+    # Independencia entre 'by' y la supervivencia (tabla grupos x {sobrevive, no sobrevive}),
+    # sin corrección de continuidad de Yates
+    table = rates(cube, by)
+    table = table[table['n'] > 0]
+    observed = np.column_stack([table['survivors'], table['n'] - table['survivors']]).astype('float64')
+    total = observed.sum()
+    expected = observed.sum(axis=1, keepdims=True) * observed.sum(axis=0, keepdims=True) / total
+
+    dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+    if dof == 0 or (expected == 0).any():
+        # Un solo grupo o nadie (o todos) sobrevivió: no hay nada que contrastar
+        return {'statistic': np.nan, 'dof': dof, 'p_value': np.nan, 'cramers_v': np.nan}
+
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    return {
+        'statistic': statistic,
+        'dof': dof,
+        'p_value': chi2_sf(statistic, dof),
+        # V de Cramér: tamaño del efecto entre 0 (independencia) y 1
+        'cramers_v': math.sqrt(statistic / (total * (min(observed.shape) - 1))),
+    }
+
+
+def significance_table(cube, factors):
+    # factors: {columna del cubo: nombre a mostrar}
+    rows = []
+    for column, label in factors.items():
+        test = chi_square_test(cube, column)
+        tested = not np.isnan(test['p_value'])
+        rows.append({
+            'Factor': label,
+            'χ²': round(test['statistic'], 1),
+            'gl': test['dof'],
+            'p-valor': f"{test['p_value']:.2e}" if tested else "—",
+            'V de Cramér': round(test['cramers_v'], 3),
+            'Significativo': ('Sí' if test['p_value'] < SIGNIFICANCE_LEVEL else 'No') if tested else "—",
+        })
+    return pd.DataFrame(rows)
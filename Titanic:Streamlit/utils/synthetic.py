@@ -0,0 +1,104 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils.data_loader import DATA_PATH, read_combined_csv
+from utils.distributions import silverman_bandwidth
+from utils.features import who_columns
+from utils.files import atomic_write
+
+# Uso desde la carpeta de la app:
+#   python -m utils.synthetic --rows 1000000
+#   python -m utils.synthetic --rows 100000000 --chunksize 1000000 --output /tmp/titanic_100M.csv
+
+
+# =====================================
+# GENERADOR DE PASAJEROS SINTÉTICOS
+# =====================================
+# Bootstrap suavizado: cada pasajero sintético copia una fila real elegida al azar
+# (así se conserva la distribución conjunta de Pclass, Sex, Embarked, TITLE, Survived,
+# SibSp, Parch...) y después se perturban Age y Fare con un kernel gaussiano.
+# Las columnas que dependen de la edad se recalculan para que cada fila sea coherente.
+# Se genera y escribe por bloques: la memoria no depende del número total de filas.
+
+DEFAULT_OUTPUT = DATA_PATH.with_name('titanic_synthetic.csv')
+
+AGE_LIMITS = (0.42, 80.0)
+
+
+def _bandwidth(values):
+    # Misma regla de Silverman que los violines (utils/distributions.py), sin los nulos
+    return silverman_bandwidth(values[~np.isnan(values)])
+
+
+def fit_source(source):
+    # Parámetros que se calculan una sola vez a partir del dataset real
+    fare = source['Fare'].to_numpy(dtype='float64')
+    return {
+        'source': source.reset_index(drop=True),
+        'age_bandwidth': _bandwidth(source['Age'].to_numpy(dtype='float64')),
+        # La tarifa es muy asimétrica: se perturba en escala logarítmica
+        'log_fare_bandwidth': _bandwidth(np.log1p(fare)),
+    }
+
+
+def generate_chunk(model, rng, first_id, size):
+    source = model['source']
+    donors = rng.integers(0, len(source), size=size)
+    chunk = source.iloc[donors].reset_index(drop=True)
+
+    age = chunk['Age'].to_numpy(dtype='float64')
+    age = age + rng.normal(0, model['age_bandwidth'], size=size)
+    chunk['Age'] = np.clip(age, *AGE_LIMITS).round(1)
+
+    log_fare = np.log1p(chunk['Fare'].to_numpy(dtype='float64'))
+    log_fare = log_fare + rng.normal(0, model['log_fare_bandwidth'], size=size)
+    chunk['Fare'] = np.expm1(np.clip(log_fare, 0, None)).round(4)
+
+    # Columnas que dependen de la edad
+    for column, values in who_columns(chunk['Age'], chunk['Sex']).items():
+        chunk[column] = values
+    chunk['menorEdad'] = chunk['Age'] < 18
+
+    # Identificadores únicos; el ticket lleva el número de réplica del dataset original
+    # para que los grupos que comparten ticket no crezcan con el tamaño de la tabla
+    ids = np.arange(first_id, first_id + size)
+    chunk['PassengerId'] = ids
+    chunk['Ticket'] = chunk['Ticket'] + '/' + (ids // len(source)).astype(str)
+    return chunk
+
+
+def generate(rows, output_path, chunksize=500_000, seed=0, source_path=DATA_PATH):
+    model = fit_source(read_combined_csv(source_path))
+    rng = np.random.default_rng(seed)
+
+    written = 0
+    with atomic_write(output_path) as tmp_path:
+        while written < rows:
+            size = min(chunksize, rows - written)
+            chunk = generate_chunk(model, rng, written + 1, size)
+            chunk.to_csv(tmp_path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+            written += size
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Genera pasajeros sintéticos con el esquema de titanic_combined.csv"
+    )
+    parser.add_argument('--rows', default=1_000_000, type=int, help="Número de filas a generar")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, type=Path, help="Ruta del CSV de salida")
+    parser.add_argument('--chunksize', default=500_000, type=int, help="Filas por bloque")
+    parser.add_argument('--seed', default=0, type=int, help="Semilla (misma semilla = mismo archivo)")
+    parser.add_argument('--source', default=DATA_PATH, type=Path, help="Dataset real del que se aprende la distribución")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = generate(args.rows, args.output, args.chunksize, args.seed, args.source)
+    print(f"{rows:,} filas escritas en {args.output} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+
+# =====================================
+# VARIABLES DE TEXTO (NAME, TICKET, CABIN)
+# =====================================
+# Título, apellido, prefijo y número de billete, y cubierta y número de camarote.
+# - Las columnas de texto (str, respaldadas por Arrow) se procesan con las funciones de
+#   texto de pyarrow.compute, que recorren el array entero en C++ sin crear objetos de
+#   Python por fila
+# - Los resultados de texto se codifican como diccionario (pc.dictionary_encode) y se
+#   devuelven como categóricas: solo se ordenan y se pasan a pandas los valores
+#   distintos (títulos, apellidos, prefijos), no las filas
+# - Los camarotes son pocos y se repiten (y la mayoría están vacíos): se procesan sus
+#   valores distintos y el resultado se reparte a las filas. Nombres y billetes son casi
+#   todos distintos y se procesan fila a fila
+# Los números salen como enteros con nulos. Cabin solo existe en Titanic-Dataset.csv:
+# sin esa columna sus variables quedan vacías.
+
+TEXT_COLUMNS = ['Surname', 'TicketPrefix', 'TicketNumber', 'CabinDeck', 'CabinNumber']
+
+# Título: palabra seguida de punto, y su agrupación (reglas del notebook EDA.titanic
+# 1.ipynb, equivalentes a su cadena de .replace). Las usan la carga de datos y el ETL
+# (utils/etl.py). El grupo con nombre es el que pide Arrow
+TITLE_PATTERN = r' (?P<value>[A-Za-z]+)\.'
+TITLE_MAP = {
+    'Master': 'Young',
+    'Ms': 'Miss',
+    'Mlle': 'Miss',
+    'Mme': 'Mrs',
+    'Don': 'Royal',
+    'Dona': 'Royal',
+    'Lady': 'Royal',
+    'Sir': 'Royal',
+    'Countess': 'Royal',
+    'Jonkheer': 'Royal',
+    'Major': 'Military',
+    'Col': 'Military',
+    'Capt': 'Military',
+    'Rev': 'Priest',
+    'Dr': 'Medical',
+}
+# Número del billete: última palabra si es solo de dígitos; el prefijo es lo que queda
+# delante ('A/5 21171' -> A5, 21171; 'LINE' -> LINE, sin número)
+# El prefijo se normaliza sin puntos, barras ni espacios: 'STON/O2.' -> 'STONO2'
+TICKET_PREFIX_NOISE = r'[\s./]+'
+# Cubierta y número del primer camarote ('C23 C25 C27' -> C, 23)
+CABIN_DECK_PATTERN = r'^\s*(?P<value>[A-Za-z])'
+CABIN_NUMBER_PATTERN = r'(?P<value>\d+)'
+
+
+def _arrow(values):
+    # Columna str de pandas -> array de Arrow (sin copia si ya está respaldada por Arrow)
+    array = pa.array(values, type=pa.large_string(), from_pandas=True)
+    return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def _extract(values, pattern):
+    # Grupo 'value' del patrón; nulo si no hay coincidencia
+    return pc.struct_field(pc.extract_regex(values, pattern), 'value')
+
+
+def _as_category(values, normalize=None):
+    # Texto por fila -> categórica con las categorías ordenadas. Se trabaja sobre el
+    # diccionario (normalize: valores distintos -> valores finales, que pueden agruparse
+    # o quedar nulos) y luego se traducen los índices de las filas de una vez
+    encoded = pc.dictionary_encode(values)
+    dictionary = encoded.dictionary
+    if normalize is None:
+        to_final = np.arange(len(dictionary))
+    else:
+        regrouped = pc.dictionary_encode(normalize(dictionary))
+        dictionary = regrouped.dictionary
+        to_final = pc.fill_null(regrouped.indices, -1).to_numpy()
+    order = pc.sort_indices(dictionary).to_numpy()
+    # La última posición (-1) es la de los nulos
+    rank = np.full(len(order) + 1, -1, dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    lookup = np.append(rank[to_final], np.int32(-1))
+    codes = lookup[pc.fill_null(encoded.indices, -1).to_numpy()]
+    categories = pd.Index(pd.Series(pc.take(dictionary, pa.array(order)), dtype='str'))
+    return pd.Categorical.from_codes(codes, categories=categories, validate=False)
+
+
+def _as_number(values):
+    # Texto de dígitos ('' o nulo -> nulo) -> entero con nulos
+    values = pc.if_else(pc.equal(values, ''), None, values)
+    return pd.array(pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False), dtype='Int64')
+
+
+def _per_value(values, parts):
+    # parts(valores distintos) -> resultados por valor distinto, repartidos a las filas
+    encoded = pc.dictionary_encode(_arrow(values))
+    rows = pc.fill_null(encoded.indices, -1).to_numpy()
+    return tuple(_to_rows(result, rows) for result in parts(encoded.dictionary))
+
+
+def _to_rows(result, rows):
+    # La última posición (-1) es la de las filas nulas
+    if isinstance(result, pd.Categorical):
+        codes = np.append(result.codes, np.int32(-1))[rows]
+        return pd.Categorical.from_codes(codes, categories=result.categories, validate=False)
+    values = np.append(result.to_numpy(dtype='float64', na_value=np.nan), np.nan)[rows]
+    return pd.array(values, dtype='Int64')
+
+
+def _group_titles(dictionary):
+    return pa.array([TITLE_MAP.get(title, title) for title in dictionary.to_pylist()], type=dictionary.type)
+
+
+def _clean_prefixes(dictionary):
+    # Billetes solo numéricos: sin prefijo
+    prefixes = pc.utf8_upper(pc.replace_substring_regex(dictionary, TICKET_PREFIX_NOISE, ''))
+    return pc.if_else(pc.equal(prefixes, ''), None, prefixes)
+
+
+def titles(names):
+    # TITLE_MAP se aplica a los títulos distintos, no a las filas
+    return _as_category(_extract(_arrow(names), TITLE_PATTERN), _group_titles)
+
+
+def surnames(names):
+    # Lo que va antes de la primera coma ('Braund, Mr. Owen Harris' -> 'Braund'); sin
+    # coma no hay apellido. Separar por un literal es mucho más rápido que una regex
+    values = _arrow(names)
+    first = pc.utf8_trim_whitespace(pc.list_element(pc.split_pattern(values, ',', max_splits=1), 0))
+    has_surname = pc.and_(pc.match_substring(values, ','), pc.not_equal(first, ''))
+    return _as_category(pc.if_else(has_surname, first, None))
+
+
+def ticket_parts(tickets):
+    # Sin regex por fila (son lo más caro de Arrow): se separa la última palabra con un
+    # split y el prefijo se limpia en su diccionario
+    values = pc.utf8_trim_whitespace(_arrow(tickets))
+    parts = pc.split_pattern(pc.fill_null(values, ''), ' ', max_splits=1, reverse=True)
+    words = pc.list_flatten(parts)
+    ends = parts.offsets.to_numpy()
+    last = words.take(pa.array(ends[1:] - 1))
+    is_number = pc.utf8_is_digit(last)
+    has_prefix = pc.and_(is_number, pc.greater(pc.list_value_length(parts), 1))
+    prefixes = pc.if_else(is_number, pc.if_else(has_prefix, words.take(pa.array(ends[:-1])), None), values)
+    return _as_category(prefixes, _clean_prefixes), _as_number(pc.if_else(is_number, last, None))
+
+
+def cabin_parts(cabins):
+    return _per_value(cabins, _cabin_parts)
+
+
+def _cabin_parts(cabins):
+    decks = pc.utf8_upper(_extract(cabins, CABIN_DECK_PATTERN))
+    return _as_category(decks), _as_number(_extract(cabins, CABIN_NUMBER_PATTERN))
+
+
+def text_features(df):
+    # Columnas de TEXT_COLUMNS para add_derived_features (utils/features.py)
+    missing = pd.Series(pd.NA, index=df.index, dtype='str')
+    ticket_prefix, ticket_number = ticket_parts(df['Ticket'])
+    cabin_deck, cabin_number = cabin_parts(df['Cabin'] if 'Cabin' in df.columns else missing)
+    return {
+        'Surname': surnames(df['Name']),
+        'TicketPrefix': ticket_prefix,
+        'TicketNumber': ticket_number,
+        'CabinDeck': cabin_deck,
+        'CabinNumber': cabin_number,
+    }
@@ -0,0 +1,78 @@
+import argparse
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from utils.data_loader import data_version, read_combined_csv, snapshot_is_stale, write_snapshot
+from utils.deltas import current_dataset
+from utils.filters import load_filter_index
+from utils.profile import dataset_profile
+
+# Uso desde la carpeta de la app, antes de arrancar el servidor:
+#   python -m utils.warmup && streamlit run app.py
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================
+# PRECARGA Y VIGILANCIA DEL DATASET
+# =====================================
+# - Antes de arrancar: se genera el snapshot Arrow del CSV actual, así la primera
+#   sesión solo mapea el archivo en lugar de parsear el CSV
+# - Con el servidor en marcha: un hilo en segundo plano comprueba cada pocos segundos
+#   si el CSV ha cambiado de contenido o hay lotes nuevos en data/deltas/, y deja
+#   cargados la tabla, el cubo, el índice de filtros y el perfil de la nueva versión
+#   antes de que los pida una sesión
+
+# Segundos entre comprobaciones del archivo de datos
+WATCH_INTERVAL = 5
+
+
+def warm_up():
+    # Carga (o reutiliza) todo lo que necesita la primera ejecución de app.py
+    df, cube = current_dataset()
+    load_filter_index(df, cube)
+    dataset_profile(df, cube)
+    return cube.attrs['fingerprint']
+
+
+def _watch(interval):
+    fingerprint = None
+    while True:
+        try:
+            current = warm_up()
+            if fingerprint is not None and current != fingerprint:
+                logger.info("Dataset recargado: %s", current)
+            fingerprint = current
+        except Exception:
+            # Un archivo ilegible no debe parar la vigilancia: se reintenta en la siguiente vuelta
+            logger.exception("No se pudo recargar el dataset")
+        time.sleep(interval)
+
+
+@st.cache_resource(show_spinner=False)
+def start_data_watcher(interval=WATCH_INTERVAL):
+    # Un único hilo por proceso (cache_resource), aunque lo llamen todas las sesiones
+    thread = threading.Thread(target=_watch, args=(interval,), name='titanic-data-watcher', daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Prepara el snapshot Arrow del dataset antes de arrancar la app"
+    )
+    parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if snapshot_is_stale():
+        write_snapshot(read_combined_csv())
+        print(f"Snapshot generado para la versión {data_version()} ({time.perf_counter() - start:.2f}s)")
+    else:
+        print(f"Snapshot al día para la versión {data_version()}")
+
+
+if __name__ == '__main__':
+    main()